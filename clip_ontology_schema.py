@@ -6,7 +6,7 @@ Focus: VISUAL, EMOTIONAL, FUNCTIONAL attributes only.
 Pure text output - no JSON.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Set
 from datetime import datetime
 
@@ -179,6 +179,19 @@ class MasterClipOntology:
                 self.emotion_function_correlations[func] = {}
             self.emotion_function_correlations[func][emotion] = self.emotion_function_correlations[func].get(emotion, 0) + 1
 
+    def to_dict(self) -> dict:
+        """Plain dict for JSON export (category value sets become sorted lists)."""
+        data = {}
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, OntologyCategory):
+                value = {
+                    "values": sorted(value.values),
+                    "frequency": dict(value.frequency),
+                }
+            data[f.name] = value
+        return data
+
     def save(self, path: str):
         """Save ontology to text file."""
         with open(path, 'w', encoding='utf-8') as f:
@@ -296,7 +309,7 @@ class MasterClipOntology:
         """Save to pickle for easy reload."""
         import pickle
         with open(path, 'wb') as f:
-            pickle.dump(self, f)
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
     def load_binary(cls, path: str) -> 'MasterClipOntology':
@@ -23,6 +23,7 @@ import sys
 import subprocess
 import glob
 import json
+import time
 from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 
@@ -377,6 +378,17 @@ def process_video(
         return False
 
 
+def _progress_bar(done_bytes: int, total_bytes: int, elapsed: float, width: int = 30) -> str:
+    """Batch progress by input bytes encoded so far, with an ETA from the rate so far."""
+    frac = done_bytes / total_bytes if total_bytes else 1.0
+    filled = int(width * frac)
+    line = f"  [{'█' * filled}{'░' * (width - filled)}] {frac:.0%} of input"
+    if 0 < frac < 1:
+        eta = elapsed * (1 - frac) / frac
+        line += f", ETA {int(eta // 60)}m{int(eta % 60):02d}s"
+    return line
+
+
 def process_directory(
     input_dir: str,
     output_dir: str = None,
@@ -411,27 +423,39 @@ def process_directory(
 
     results = {'success': 0, 'skipped': 0, 'failed': 0}
 
-    for i, video_path in enumerate(videos, 1):
+    # Skip finished outputs before any work, so progress covers only what gets encoded
+    pending = []
+    for video_path in videos:
         filename = os.path.basename(video_path)
         name, _ = os.path.splitext(filename)
         output_path = os.path.join(output_dir, f"{name}.mp4")
 
-        print(f"\n[{i}/{len(videos)}] {filename}")
-        print("-" * 50)
-
         # Check if output already exists
         if os.path.exists(output_path):
             existing_size = os.path.getsize(output_path) / (1024 * 1024)
             if existing_size <= target_size_mb:
-                print(f"  ✓ Already processed ({existing_size:.1f}MB)")
+                print(f"✓ Already processed: {filename} ({existing_size:.1f}MB)")
                 results['skipped'] += 1
                 continue
 
+        pending.append((video_path, output_path, os.path.getsize(video_path)))
+
+    total_bytes = sum(size for _, _, size in pending)
+    done_bytes = 0
+    start = time.time()
+
+    for i, (video_path, output_path, size) in enumerate(pending, 1):
+        print(f"\n[{i}/{len(pending)}] {os.path.basename(video_path)}")
+        print("-" * 50)
+
         if process_video(video_path, output_path, target_size_mb):
             results['success'] += 1
         else:
             results['failed'] += 1
 
+        done_bytes += size
+        print(_progress_bar(done_bytes, total_bytes, time.time() - start))
+
     # Summary
     print(f"\n{'='*60}")
     print("SUMMARY")
@@ -15,6 +15,13 @@ class Config:
     VERTEX_PROJECT_ID = os.getenv('VERTEX_PROJECT_ID')
     VERTEX_LOCATION = os.getenv('VERTEX_LOCATION', 'us-central1')
     
+    # Stop reading a Gemini response stream once its JSON object is complete
+    # (set to "false" to keep any trailing model output, e.g. for debugging)
+    GEMINI_STOP_AT_JSON_END = os.getenv('GEMINI_STOP_AT_JSON_END', 'true').lower() == 'true'
+
+    # Upper bound on Gemini requests in flight across all parallel chunk workers
+    GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', '12'))
+    
     # Video processing configuration
     MAX_HEIGHT = 720
     TEMP_DIR = '/tmp/video_processing'
@@ -1,65 +1,280 @@
 import json
 import os
-import base64
+import re
 import sys
+import time
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from google import genai
 from google.genai import types
 from typing import Dict, Any, Optional, List
 from config import Config
 
+# Videos at or above this size go through the Files API rather than inline bytes
+FILES_API_THRESHOLD_MB = 8
+
+# Request size cap for inline video bytes, and the Files API's per-file cap
+INLINE_MAX_MB = 20
+FILES_API_MAX_MB = 2048
+
+# Concurrent Gemini calls when slideshow batches are analyzed in parallel
+SLIDE_BATCH_WORKERS = 4
+
+# text-embedding-004 returns 768-dimensional vectors, but our DB expects 512
+EMBEDDING_DIM = 512
+
+# Ask Gemini for a bare JSON body (no markdown fences or prose); the prompts describe the shape
+JSON_RESPONSE_CONFIG = types.GenerateContentConfig(response_mime_type="application/json")
+
+# Compiled once at import: markdown code fences around a response, and JSON structural characters
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+
+class _JsonObjectScanner:
+    """Incremental, string-aware brace matcher that finds where the first {...} object ends.
+    
+    Text can be fed in pieces (e.g. streamed response chunks); start/end are offsets into
+    the concatenation of everything fed so far.
+    """
+    
+    def __init__(self):
+        self.start = -1
+        self.end = -1
+        self._offset = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped_pos = -1
+    
+    def feed(self, text: str) -> bool:
+        """Consume the next piece of text; returns True once the object is complete"""
+        base = self._offset
+        self._offset += len(text)
+        if self.end != -1:
+            return True
+        
+        pos = 0
+        if self.start == -1:
+            pos = text.find('{')
+            if pos == -1:
+                return False
+            self.start = base + pos
+        
+        # Only braces, quotes and backslashes matter; finditer skips everything else in C
+        for match in _JSON_STRUCTURE_RE.finditer(text, pos):
+            i = base + match.start()
+            if i == self._escaped_pos:
+                continue
+            ch = match.group()
+            if self._in_string:
+                if ch == '\\':
+                    self._escaped_pos = i + 1
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = i + 1
+                    return True
+        return False
+
+
+def _extract_json_object(text: str) -> str:
+    """Return the first balanced {...} object in text using a single pass that skips braces inside strings"""
+    scanner = _JsonObjectScanner()
+    if scanner.feed(text):
+        return text[scanner.start:scanner.end]
+    if scanner.start == -1:
+        raise json.JSONDecodeError("No opening brace found", text, 0)
+    raise json.JSONDecodeError("Unbalanced braces in response", text, scanner.start)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> genai.Client:
+    """Process-wide Gemini client, so every analyzer shares one connection pool"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = genai.Client(api_key=Config.GOOGLE_API_KEY)
+    return _client
+
+
+def _compact_json(data: Any) -> str:
+    """Serialize data for embedding in a prompt: no indentation or padding, non-ASCII kept as-is"""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def _fit_embedding(values) -> list:
+    """Truncate or zero-pad an embedding to EMBEDDING_DIM, building the result list in place"""
+    embedding = list(values[:EMBEDDING_DIM])
+    missing = EMBEDDING_DIM - len(embedding)
+    if missing:
+        embedding.extend([0.0] * missing)
+    return embedding
+
+
+@lru_cache(maxsize=8)
+def _prompt_part(prompt: str) -> types.Part:
+    """Text Part for a static prompt, built once per distinct prompt (callers must not mutate it)"""
+    return types.Part.from_text(text=prompt)
+
+
+def _collect_stream_text(response_stream, stop_at_json_end: bool = False) -> str:
+    """Join the text of all streamed response chunks (one concatenation instead of repeated +=).
+    
+    With stop_at_json_end the stream is closed as soon as the first JSON object is complete,
+    instead of waiting for any trailing text the model adds after it.
+    """
+    parts = []
+    scanner = _JsonObjectScanner() if stop_at_json_end else None
+    for chunk in response_stream:
+        text = chunk.text
+        if text:
+            parts.append(text)
+            if scanner is not None and scanner.feed(text):
+                _close_stream(response_stream)
+                break
+    return "".join(parts)
+
+
+def _close_stream(response_stream):
+    """Stop a response stream early so the underlying HTTP request is released"""
+    close = getattr(response_stream, 'close', None)
+    if close is not None:
+        close()
+
+
+def _pain_point_strings(pain_points) -> List[str]:
+    """Normalize a pain point field (a string or a list of strings) to stripped, non-empty strings"""
+    if isinstance(pain_points, str):
+        pain_points = [pain_points]
+    elif not isinstance(pain_points, list):
+        return []
+    return [pp.strip() for pp in pain_points if isinstance(pp, str) and pp.strip()]
+
+
+@dataclass
+class BatchResult:
+    """Analysis of one slide batch, with the fields the slideshow pipeline reads pulled out once"""
+    analysis: Dict[str, Any]  # full parsed batch JSON, passed on to the final analysis prompt
+    individual_slides: List[Dict[str, Any]]
+    hook_pain_points: List[str]
+    context_for_next_batch: Optional[Dict[str, Any]]
+    
+    @classmethod
+    def from_analysis(cls, analysis: Dict[str, Any]) -> 'BatchResult':
+        """Build from a parsed batch response, extracting hook-specific pain points before they get aggregated"""
+        slides = analysis.get('individual_slides') or []
+        hook_pain_points = []
+        
+        try:
+            # Check slideshow_hook_analysis.pain_point_analysis
+            pain_analysis = (analysis.get('slideshow_hook_analysis') or {}).get('pain_point_analysis')
+            if pain_analysis:
+                # Extract pain_points_addressed and primary_pain_point
+                hook_pain_points.extend(_pain_point_strings(pain_analysis.get('pain_points_addressed')))
+                hook_pain_points.extend(_pain_point_strings(pain_analysis.get('primary_pain_point')))
+            
+            # Also check any hook-related analysis in individual slides from first slide
+            if slides and slides[0].get('slide_number') == 1:
+                # Check if first slide has hook-specific pain point analysis
+                pain_indicators = slides[0].get('pain_point_indicators')
+                if pain_indicators:
+                    hook_pain_points.extend(_pain_point_strings(pain_indicators.get('pain_points_present')))
+        except Exception as e:
+            print(f"      ⚠️  Error extracting hook pain points: {str(e)}")
+        
+        return cls(
+            analysis=analysis,
+            individual_slides=slides,
+            hook_pain_points=hook_pain_points,
+            context_for_next_batch=analysis.get('context_for_next_batch')
+        )
+
+
 class GeminiAnalyzer:
+    # Prompt templates, loaded lazily and shared by all instances
+    _SLIDE_PROMPT = None
+    _FINAL_PROMPT = None
+    
     def __init__(self):
-        self.client = genai.Client(api_key=Config.GOOGLE_API_KEY)
+        self.client = _get_client()
         self.slideshow_context = {}  # Store context between batch calls
     
     def analyze_video(self, video_path: str, metadata: Dict[str, Any], transcript: str) -> Dict[str, Any]:
         """Analyze video using Gemini 2.0 Flash and return structured analysis"""
+        uploaded_file = None
         try:
             print(f"Analyzing video: {video_path}")
             
-            # Read video file as bytes
-            with open(video_path, 'rb') as f:
-                video_bytes = f.read()
-            
-            # Check file size (20MB limit for inline data)
-            file_size_mb = len(video_bytes) / (1024 * 1024)
+            # Check file size before any bytes are read
+            file_size = os.stat(video_path).st_size
+            file_size_mb = file_size / (1024 * 1024)
             print(f"Video file size: {file_size_mb:.2f} MB")
             
-            if file_size_mb > 20:
-                raise Exception(f"Video file too large ({file_size_mb:.2f} MB). Must be under 20MB for inline processing.")
-            
-            # Get the analysis prompt
-            prompt = Config.get_analysis_prompt()
+            # Get the analysis prompt (the same text Part is reused for every video)
+            prompt_part = _prompt_part(Config.get_analysis_prompt())
+            
+            if file_size_mb >= FILES_API_THRESHOLD_MB:
+                if file_size_mb > FILES_API_MAX_MB:
+                    raise Exception(f"Video file too large ({file_size_mb:.2f} MB). Must be under {FILES_API_MAX_MB}MB for the Gemini Files API.")
+                # Larger videos are streamed from disk by the Files API instead of buffered in memory
+                print("Uploading video to Gemini Files API...")
+                uploaded_file = self._upload_video_file(video_path)
+                video_part = types.Part.from_uri(
+                    file_uri=uploaded_file.uri,
+                    mime_type=uploaded_file.mime_type
+                )
+            else:
+                if file_size_mb > INLINE_MAX_MB:
+                    raise Exception(f"Video file too large ({file_size_mb:.2f} MB). Must be under {INLINE_MAX_MB}MB for inline processing.")
+                print("Sending request to Gemini with inline video data...")
+                with open(video_path, 'rb') as f:
+                    video_part = types.Part.from_bytes(
+                        mime_type="video/mp4",
+                        data=f.read(file_size)
+                    )
             
-            print("Sending request to Gemini with inline video data...")
-            # Generate analysis using inline data method with the correct API format
-            # Use new API format
             contents = [types.Content(
                 role="user",
                 parts=[
-                    types.Part.from_bytes(
-                        mime_type="video/mp4",
-                        data=video_bytes
-                    ),
-                    types.Part.from_text(text=prompt)
+                    video_part,
+                    prompt_part
                 ]
             )]
 
             print("Waiting for Gemini response (this may take 30-60 seconds)...")
             response_stream = self.client.models.generate_content_stream(
                 model="gemini-2.5-flash",
-                contents=contents
+                contents=contents,
+                config=JSON_RESPONSE_CONFIG
             )
 
             # Collect response text
-            response_text = ""
-            chunk_count = 0
+            response_parts = []
+            received_chars = 0
+            scanner = _JsonObjectScanner() if Config.GEMINI_STOP_AT_JSON_END else None
             for chunk in response_stream:
-                if chunk.text:
-                    response_text += chunk.text
-                    chunk_count += 1
-                    if chunk_count % 5 == 0:
-                        print(f"  Receiving response... ({len(response_text)} chars so far)")
+                text = chunk.text
+                if text:
+                    response_parts.append(text)
+                    received_chars += len(text)
+                    if len(response_parts) % 5 == 0:
+                        print(f"  Receiving response... ({received_chars} chars so far)")
+                    if scanner is not None and scanner.feed(text):
+                        _close_stream(response_stream)
+                        break
+            response_text = "".join(response_parts)
 
             print(f"Received complete response from Gemini ({len(response_text)} chars)")
             
@@ -68,68 +283,14 @@ class GeminiAnalyzer:
                 response_text = response_text.strip()
                 print(f"Raw response length: {len(response_text)} characters")
                 
-                # Multiple attempts to clean and parse the JSON
-                analysis_data = None
-                
-                # Attempt 1: Clean markdown code blocks
-                clean_text = response_text
-                if clean_text.startswith('```json'):
-                    clean_text = clean_text[7:]
-                if clean_text.startswith('```'):
-                    clean_text = clean_text[3:]
-                if clean_text.endswith('```'):
-                    clean_text = clean_text[:-3]
-                clean_text = clean_text.strip()
-                
-                try:
-                    analysis_data = json.loads(clean_text)
-                    print("✅ Successfully parsed JSON (attempt 1)")
-                except json.JSONDecodeError:
-                    pass
-                
-                # Attempt 2: Find JSON block with regex
-                if analysis_data is None:
-                    import re
-                    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                    if json_match:
-                        try:
-                            analysis_data = json.loads(json_match.group())
-                            print("✅ Successfully parsed JSON (attempt 2 - regex)")
-                        except json.JSONDecodeError:
-                            pass
-                
-                # Attempt 3: Try to find and extract just the JSON content
-                if analysis_data is None:
-                    lines = response_text.split('\n')
-                    json_lines = []
-                    in_json = False
-                    brace_count = 0
-                    
-                    for line in lines:
-                        if '{' in line and not in_json:
-                            in_json = True
-                            brace_count += line.count('{') - line.count('}')
-                            json_lines.append(line)
-                        elif in_json:
-                            brace_count += line.count('{') - line.count('}')
-                            json_lines.append(line)
-                            if brace_count <= 0:
-                                break
-                    
-                    if json_lines:
-                        try:
-                            json_text = '\n'.join(json_lines)
-                            analysis_data = json.loads(json_text)
-                            print("✅ Successfully parsed JSON (attempt 3 - line parsing)")
-                        except json.JSONDecodeError:
-                            pass
-                
-                if analysis_data is None:
-                    raise json.JSONDecodeError("Could not parse JSON after multiple attempts", response_text, 0)
+                # Strip markdown code blocks, then take the first balanced JSON object
+                clean_text = _FENCE_RE.sub('', response_text)
+                analysis_data = json.loads(_extract_json_object(clean_text))
+                print("✅ Successfully parsed JSON")
                 
             except json.JSONDecodeError as e:
                 print(f"❌ JSON decode error after all attempts: {e}")
-                print(f"Response text (first 1000 chars): {response.text[:1000]}...")
+                print(f"Response text (first 1000 chars): {response_text[:1000]}...")
                 
                 # Enhanced fallback: create structured data from any available info
                 analysis_data = {
@@ -196,7 +357,7 @@ class GeminiAnalyzer:
                         "content_tags": [],
                         "educational_entertainment_ratio": 0.0
                     },
-                    "raw_response": response.text,
+                    "raw_response": response_text,
                     "error": f"JSON parsing failed: {str(e)}"
                 }
             
@@ -205,52 +366,85 @@ class GeminiAnalyzer:
         except Exception as e:
             print(f"Error in analyze_video: {str(e)}")
             raise Exception(f"Failed to analyze video with Gemini: {str(e)}")
+        finally:
+            if uploaded_file is not None:
+                self._delete_uploaded_file(uploaded_file)
+    
+    def _upload_video_file(self, video_path: str):
+        """Upload a video through the Files API and wait until Gemini has finished processing it"""
+        uploaded_file = self.client.files.upload(
+            file=video_path,
+            config=types.UploadFileConfig(mime_type="video/mp4")
+        )
+        while uploaded_file.state and uploaded_file.state.name == "PROCESSING":
+            time.sleep(2)
+            uploaded_file = self.client.files.get(name=uploaded_file.name)
+        
+        if uploaded_file.state and uploaded_file.state.name == "FAILED":
+            raise Exception(f"Gemini could not process uploaded video: {video_path}")
+        return uploaded_file
+    
+    def _delete_uploaded_file(self, uploaded_file):
+        """Remove an uploaded file from the Files API (best effort)"""
+        try:
+            self.client.files.delete(name=uploaded_file.name)
+        except Exception as e:
+            print(f"Warning: Failed to delete uploaded file {uploaded_file.name}: {str(e)}")
     
     def generate_embeddings(self, text: str) -> list:
         """Generate embeddings for text using Gemini"""
+        return self.generate_embeddings_batch([text])[0]
+    
+    def generate_embeddings_batch(self, texts: List[str]) -> List[list]:
+        """Generate embeddings for several texts with a single Gemini request"""
+        # Empty texts (and any failure) get a 512-dimensional zero vector for database compatibility
+        embeddings = [[0.0] * EMBEDDING_DIM for _ in texts]
+        
+        indexed_texts = [(i, text.strip()) for i, text in enumerate(texts) if text and text.strip()]
+        if len(indexed_texts) < len(texts):
+            print("Warning: Empty text provided for embeddings")
+        if not indexed_texts:
+            return embeddings
+        
         try:
-            if not text or not text.strip():
-                print("Warning: Empty text provided for embeddings")
-                return [0.0] * 512  # Return 512-dimensional zero vector for database compatibility
-            
-            # Use Gemini's embedding model
-            result = genai.embed_content(
-                model="models/text-embedding-004",
-                content=text.strip()
+            # Use Gemini's embedding model; one request embeds the whole list
+            result = self.client.models.embed_content(
+                model="text-embedding-004",
+                contents=[text for _, text in indexed_texts]
             )
             
-            # text-embedding-004 returns 768-dimensional vectors, but our DB expects 512
-            # We'll truncate to 512 dimensions for now
-            embedding = result['embedding']
-            return embedding[:512] if len(embedding) > 512 else embedding + [0.0] * (512 - len(embedding))
+            for (i, _), content_embedding in zip(indexed_texts, result.embeddings):
+                embeddings[i] = _fit_embedding(content_embedding.values)
             
         except Exception as e:
             print(f"Warning: Failed to generate embeddings: {str(e)}")
-            # Return zero vector as fallback
-            return [0.0] * 512
+        
+        return embeddings
     
     def create_combined_text(self, metadata: Dict[str, Any], transcript: str, analysis: Dict[str, Any]) -> str:
         """Create combined text for embedding generation"""
         parts = []
         
         # Add title and description
-        if metadata.get('title'):
-            parts.append(f"Title: {metadata['title']}")
-        if metadata.get('description'):
-            parts.append(f"Description: {metadata['description'][:500]}")
+        title = metadata.get('title')
+        if title:
+            parts.append(f"Title: {title}")
+        description = metadata.get('description')
+        if description:
+            parts.append(f"Description: {description[:500]}")
         
         # Add transcript
         if transcript:
             parts.append(f"Transcript: {transcript[:1000]}")
         
         # Add key analysis points
-        content_class = analysis.get('content_classification', {})
-        if content_class.get('primary_vertical'):
-            parts.append(f"Category: {content_class['primary_vertical']}")
+        primary_vertical = (analysis.get('content_classification') or {}).get('primary_vertical')
+        if primary_vertical:
+            parts.append(f"Category: {primary_vertical}")
         
-        hook_analysis = analysis.get('hook_analysis', {})
-        if hook_analysis.get('hook_type'):
-            parts.append(f"Hook type: {hook_analysis['hook_type']}")
+        hook_type = (analysis.get('hook_analysis') or {}).get('hook_type')
+        if hook_type:
+            parts.append(f"Hook type: {hook_type}")
         
         return " ".join(parts)
     
@@ -259,21 +453,29 @@ class GeminiAnalyzer:
         visual_parts = []
         
         # Extract from hook analysis visual elements
-        hook_visual = analysis.get('hook_analysis', {}).get('visual_elements', {})
-        if hook_visual.get('attention_anchors'):
-            visual_parts.append(f"Visual anchors: {', '.join(hook_visual['attention_anchors'])}")
-        if hook_visual.get('text_overlays'):
-            visual_parts.append(f"Text overlays: {', '.join(hook_visual['text_overlays'])}")
+        hook_visual = (analysis.get('hook_analysis') or {}).get('visual_elements') or {}
+        attention_anchors = hook_visual.get('attention_anchors')
+        if attention_anchors:
+            visual_parts.append(f"Visual anchors: {', '.join(attention_anchors)}")
+        text_overlays = hook_visual.get('text_overlays')
+        if text_overlays:
+            visual_parts.append(f"Text overlays: {', '.join(text_overlays)}")
         
         # Extract from visual analysis
-        visual_analysis = analysis.get('visual_analysis', {})
-        if visual_analysis.get('color_psychology', {}).get('dominant_colors'):
-            visual_parts.append(f"Colors: {', '.join(visual_analysis['color_psychology']['dominant_colors'])}")
+        color_psychology = (analysis.get('visual_analysis') or {}).get('color_psychology') or {}
+        dominant_colors = color_psychology.get('dominant_colors')
+        if dominant_colors:
+            visual_parts.append(f"Colors: {', '.join(dominant_colors)}")
         
         return " ".join(visual_parts)
     
-    def analyze_slideshow(self, image_paths: List[str], metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze complete slideshow using multi-batch approach with context preservation"""
+    def analyze_slideshow(self, image_paths: List[str], metadata: Dict[str, Any],
+                          parallel_batches: bool = True) -> Dict[str, Any]:
+        """Analyze complete slideshow using multi-batch approach.
+        
+        With parallel_batches the batches are analyzed concurrently and independently;
+        otherwise they run one after another, each seeing the previous batch's narrative context.
+        """
         try:
             print(f"🖼️  Analyzing slideshow with {len(image_paths)} images")
             
@@ -283,29 +485,57 @@ class GeminiAnalyzer:
                 'total_slides': len(image_paths),
                 'batches_completed': 0,
                 'all_slides_data': [],
-                'narrative_context': {}
+                'narrative_context': {},
+                'narrative_context_json': None  # serialized narrative_context, refreshed when it changes
             }
             
             # Process images in batches of 3
             batch_size = 3
             all_batch_results = []
+            batches = []
             
             for i in range(0, len(image_paths), batch_size):
-                batch_images = image_paths[i:i+batch_size]
-                batch_number = (i // batch_size) + 1
-                start_slide = i + 1
-                end_slide = min(i + batch_size, len(image_paths))
-                
-                print(f"   📸 Processing batch {batch_number}: slides {start_slide}-{end_slide}")
-                
-                batch_result = self._analyze_slide_batch(
-                    batch_images, 
-                    batch_number, 
-                    start_slide, 
-                    end_slide,
-                    len(image_paths),
-                    video_id
-                )
+                batches.append((
+                    image_paths[i:i+batch_size],
+                    (i // batch_size) + 1,
+                    i + 1,
+                    min(i + batch_size, len(image_paths))
+                ))
+            
+            if parallel_batches:
+                # Batches don't see each other's narrative context, so they can all run at once
+                print(f"   📸 Processing {len(batches)} batches with {SLIDE_BATCH_WORKERS} workers")
+                with ThreadPoolExecutor(max_workers=SLIDE_BATCH_WORKERS) as executor:
+                    futures = [
+                        executor.submit(
+                            self._analyze_slide_batch,
+                            batch_images,
+                            batch_number,
+                            start_slide,
+                            end_slide,
+                            len(image_paths),
+                            video_id
+                        )
+                        for batch_images, batch_number, start_slide, end_slide in batches
+                    ]
+                    batch_results = [future.result() for future in futures]
+            else:
+                batch_results = None
+            
+            for index, (batch_images, batch_number, start_slide, end_slide) in enumerate(batches):
+                if batch_results is not None:
+                    batch_result = batch_results[index]
+                else:
+                    print(f"   📸 Processing batch {batch_number}: slides {start_slide}-{end_slide}")
+                    
+                    batch_result = self._analyze_slide_batch(
+                        batch_images, 
+                        batch_number, 
+                        start_slide, 
+                        end_slide,
+                        len(image_paths),
+                        video_id
+                    )
                 
                 if batch_result:
                     all_batch_results.append(batch_result)
@@ -330,7 +560,7 @@ class GeminiAnalyzer:
     
     def _analyze_slide_batch(self, image_paths: List[str], batch_number: int, 
                             start_slide: int, end_slide: int, total_slides: int, 
-                            video_id: str) -> Optional[Dict[str, Any]]:
+                            video_id: str) -> Optional[BatchResult]:
         """Analyze a batch of slideshow images (up to 3 images)"""
         try:
             # Load slide analysis prompt
@@ -338,12 +568,12 @@ class GeminiAnalyzer:
             
             # Get previous context for this slideshow
             context = self.slideshow_context.get(video_id, {})
-            previous_context = context.get('narrative_context', {})
+            previous_context_json = context.get('narrative_context_json')
             
             # Format prompt with context
             try:
                 formatted_prompt = slide_prompt.format(
-                    previous_slides_context=json.dumps(previous_context, indent=2) if previous_context else "No previous context - this is the first batch",
+                    previous_slides_context=previous_context_json or "No previous context - this is the first batch",
                     start_slide_number=start_slide,
                     end_slide_number=end_slide,
                     total_slides=total_slides
@@ -358,18 +588,18 @@ class GeminiAnalyzer:
             
             # Add all images in the batch
             for image_path in image_paths:
-                if os.path.exists(image_path):
+                # Bytes go straight into the Part so no local keeps an extra reference to them
+                try:
                     with open(image_path, 'rb') as f:
-                        image_data = f.read()
-                    
-                    content_parts.append(
-                        types.Part.from_bytes(
+                        image_part = types.Part.from_bytes(
                             mime_type="image/jpeg",
-                            data=image_data
+                            data=f.read()
                         )
-                    )
-                else:
+                except FileNotFoundError:
                     print(f"   ⚠️  Image not found: {image_path}")
+                    continue
+                
+                content_parts.append(image_part)
             
             # Add prompt text
             content_parts.append(types.Part.from_text(text=formatted_prompt))
@@ -381,28 +611,28 @@ class GeminiAnalyzer:
             print(f"      🧠 Analyzing batch {batch_number} with Gemini...")
             response_stream = self.client.models.generate_content_stream(
                 model="gemini-2.5-flash",
-                contents=contents
+                contents=contents,
+                config=JSON_RESPONSE_CONFIG
             )
             
             # Collect response text
-            response_text = ""
-            for chunk in response_stream:
-                if chunk.text:
-                    response_text += chunk.text
+            response_text = _collect_stream_text(
+                response_stream, stop_at_json_end=Config.GEMINI_STOP_AT_JSON_END
+            )
             
             print(f"      ✅ Received response for batch {batch_number}")
             
             # Parse JSON response
             batch_analysis = self._parse_json_response(response_text, f"batch {batch_number}")
             
-            return batch_analysis
+            return BatchResult.from_analysis(batch_analysis)
             
         except Exception as e:
             print(f"      ❌ Error analyzing batch {batch_number}: {str(e)}")
             return None
     
     def _final_slideshow_analysis(self, video_id: str, metadata: Dict[str, Any], 
-                                 batch_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                 batch_results: List[BatchResult]) -> Dict[str, Any]:
         """Perform final comprehensive slideshow analysis using all batch data"""
         try:
             # Load final slideshow prompt
@@ -415,8 +645,7 @@ class GeminiAnalyzer:
             # Compile all slides data
             all_slides_data = []
             for batch_result in batch_results:
-                if batch_result and 'individual_slides' in batch_result:
-                    all_slides_data.extend(batch_result['individual_slides'])
+                all_slides_data.extend(batch_result.individual_slides)
             
             # Prepare slideshow metadata
             slideshow_metadata = {
@@ -434,8 +663,8 @@ class GeminiAnalyzer:
             # Format final prompt
             try:
                 formatted_prompt = final_prompt.format(
-                    all_slides_data=json.dumps(batch_results, indent=2),
-                    slideshow_metadata=json.dumps(slideshow_metadata, indent=2)
+                    all_slides_data=_compact_json([batch_result.analysis for batch_result in batch_results]),
+                    slideshow_metadata=_compact_json(slideshow_metadata)
                 )
                 print(f"      📝 Final prompt formatted successfully")
             except Exception as format_error:
@@ -451,14 +680,14 @@ class GeminiAnalyzer:
             
             response_stream = self.client.models.generate_content_stream(
                 model="gemini-2.5-flash",
-                contents=contents
+                contents=contents,
+                config=JSON_RESPONSE_CONFIG
             )
             
             # Collect response text
-            response_text = ""
-            for chunk in response_stream:
-                if chunk.text:
-                    response_text += chunk.text
+            response_text = _collect_stream_text(
+                response_stream, stop_at_json_end=Config.GEMINI_STOP_AT_JSON_END
+            )
             
             final_analysis = self._parse_json_response(response_text, "final analysis")
             
@@ -475,154 +704,65 @@ class GeminiAnalyzer:
             # Return basic structure with error
             return self._create_fallback_slideshow_analysis(metadata, str(e))
     
-    def _extract_hook_pain_points_from_batches(self, batch_results: List[Dict[str, Any]]) -> List[str]:
-        """Extract hook-specific pain points from batch results before they get aggregated"""
-        hook_pain_points = []
-        
-        try:
-            for batch_result in batch_results:
-                if not batch_result:
-                    continue
-                
-                # Check slideshow_hook_analysis.pain_point_analysis
-                if 'slideshow_hook_analysis' in batch_result:
-                    hook_analysis = batch_result['slideshow_hook_analysis']
-                    if 'pain_point_analysis' in hook_analysis:
-                        pain_analysis = hook_analysis['pain_point_analysis']
-                        
-                        # Extract pain_points_addressed
-                        if 'pain_points_addressed' in pain_analysis:
-                            pain_points = pain_analysis['pain_points_addressed']
-                            if isinstance(pain_points, list):
-                                hook_pain_points.extend(pain_points)
-                            elif isinstance(pain_points, str) and pain_points.strip():
-                                hook_pain_points.append(pain_points.strip())
-                        
-                        # Extract primary_pain_point
-                        if 'primary_pain_point' in pain_analysis:
-                            primary_pain = pain_analysis['primary_pain_point']
-                            if primary_pain and primary_pain.strip():
-                                hook_pain_points.append(primary_pain.strip())
-                
-                # Also check any hook-related analysis in individual slides from first slide
-                if 'individual_slides' in batch_result:
-                    slides = batch_result['individual_slides']
-                    if slides and len(slides) > 0:
-                        first_slide = slides[0]
-                        if 'slide_number' in first_slide and first_slide['slide_number'] == 1:
-                            # Check if first slide has hook-specific pain point analysis
-                            if 'pain_point_indicators' in first_slide:
-                                pain_indicators = first_slide['pain_point_indicators']
-                                if 'pain_points_present' in pain_indicators:
-                                    pain_points = pain_indicators['pain_points_present']
-                                    if isinstance(pain_points, list):
-                                        hook_pain_points.extend(pain_points)
-                                    elif isinstance(pain_points, str) and pain_points.strip():
-                                        hook_pain_points.append(pain_points.strip())
-            
-            # Remove duplicates and empty strings
-            hook_pain_points = list(set([pp.strip() for pp in hook_pain_points if pp and pp.strip()]))
-            
-        except Exception as e:
-            print(f"      ⚠️  Error extracting hook pain points: {str(e)}")
-        
-        return hook_pain_points
+    def _extract_hook_pain_points_from_batches(self, batch_results: List[BatchResult]) -> List[str]:
+        """Collect hook-specific pain points from all batches, deduplicated in first-seen order"""
+        return list(dict.fromkeys(
+            pain_point
+            for batch_result in batch_results
+            for pain_point in batch_result.hook_pain_points
+        ))
     
-    def _update_slideshow_context(self, video_id: str, batch_result: Dict[str, Any]):
+    def _update_slideshow_context(self, video_id: str, batch_result: BatchResult):
         """Update slideshow context with latest batch results"""
-        if video_id not in self.slideshow_context:
+        context = self.slideshow_context.get(video_id)
+        if context is None:
             return
         
-        context = self.slideshow_context[video_id]
         context['batches_completed'] += 1
         
         # Extract context for next batch from current batch
-        if 'context_for_next_batch' in batch_result:
-            context['narrative_context'] = batch_result['context_for_next_batch']
+        next_batch_context = batch_result.context_for_next_batch
+        if next_batch_context is not None:
+            context['narrative_context'] = next_batch_context
+            context['narrative_context_json'] = _compact_json(next_batch_context) if next_batch_context else None
         
         # Store individual slides data
-        if 'individual_slides' in batch_result:
-            context['all_slides_data'].extend(batch_result['individual_slides'])
+        context['all_slides_data'].extend(batch_result.individual_slides)
     
     def _load_slide_analysis_prompt(self) -> str:
-        """Load the slide analysis prompt template"""
-        try:
-            prompt_path = os.path.join(os.path.dirname(__file__), 'config_files/slide_analysis_prompt.txt')
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"⚠️  Could not load slide analysis prompt: {e}")
-            return self._get_default_slide_prompt()
+        """Load the slide analysis prompt template (read from disk once per process)"""
+        if GeminiAnalyzer._SLIDE_PROMPT is None:
+            try:
+                prompt_path = os.path.join(os.path.dirname(__file__), 'config_files/slide_analysis_prompt.txt')
+                with open(prompt_path, 'r', encoding='utf-8') as f:
+                    GeminiAnalyzer._SLIDE_PROMPT = f.read()
+            except Exception as e:
+                print(f"⚠️  Could not load slide analysis prompt: {e}")
+                GeminiAnalyzer._SLIDE_PROMPT = self._get_default_slide_prompt()
+        return GeminiAnalyzer._SLIDE_PROMPT
     
     def _load_final_slideshow_prompt(self) -> str:
-        """Load the final slideshow analysis prompt template"""
-        try:
-            prompt_path = os.path.join(os.path.dirname(__file__), 'config_files/final_slideshow_prompt.txt')
-            with open(prompt_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            print(f"⚠️  Could not load final slideshow prompt: {e}")
-            return self._get_default_final_prompt()
+        """Load the final slideshow analysis prompt template (read from disk once per process)"""
+        if GeminiAnalyzer._FINAL_PROMPT is None:
+            try:
+                prompt_path = os.path.join(os.path.dirname(__file__), 'config_files/final_slideshow_prompt.txt')
+                with open(prompt_path, 'r', encoding='utf-8') as f:
+                    GeminiAnalyzer._FINAL_PROMPT = f.read()
+            except Exception as e:
+                print(f"⚠️  Could not load final slideshow prompt: {e}")
+                GeminiAnalyzer._FINAL_PROMPT = self._get_default_final_prompt()
+        return GeminiAnalyzer._FINAL_PROMPT
     
     def _parse_json_response(self, response_text: str, context: str = "") -> Dict[str, Any]:
         """Parse JSON response with robust error handling"""
         try:
             print(f"      📄 Parsing response for {context} ({len(response_text)} chars)")
             
-            # Clean response text
-            clean_text = response_text.strip()
-            
-            # Remove markdown code blocks
-            if clean_text.startswith('```json'):
-                clean_text = clean_text[7:]
-            elif clean_text.startswith('```'):
-                clean_text = clean_text[3:]
-            if clean_text.endswith('```'):
-                clean_text = clean_text[:-3]
-            clean_text = clean_text.strip()
-            
-            # Attempt 1: Direct JSON parsing
-            try:
-                parsed_json = json.loads(clean_text)
-                print(f"      ✅ JSON parsed successfully for {context}")
-                return parsed_json
-            except json.JSONDecodeError as e:
-                print(f"      ⚠️  Direct JSON parsing failed for {context}: {str(e)[:100]}")
-            
-            # Attempt 2: Find JSON block with regex
-            import re
-            json_pattern = r'\{(?:[^{}]|{(?:[^{}]|{[^{}]*})*})*\}'
-            json_matches = re.findall(json_pattern, response_text, re.DOTALL)
-            
-            for i, json_match in enumerate(json_matches):
-                try:
-                    parsed_json = json.loads(json_match)
-                    print(f"      ✅ JSON parsed with regex (match {i+1}) for {context}")
-                    return parsed_json
-                except json.JSONDecodeError:
-                    continue
-            
-            # Attempt 3: Extract JSON manually by finding balanced braces
-            brace_count = 0
-            start_idx = response_text.find('{')
-            if start_idx == -1:
-                raise json.JSONDecodeError("No opening brace found", response_text, 0)
-            
-            for i in range(start_idx, len(response_text)):
-                if response_text[i] == '{':
-                    brace_count += 1
-                elif response_text[i] == '}':
-                    brace_count -= 1
-                    if brace_count == 0:
-                        json_text = response_text[start_idx:i+1]
-                        try:
-                            parsed_json = json.loads(json_text)
-                            print(f"      ✅ JSON parsed with manual extraction for {context}")
-                            return parsed_json
-                        except json.JSONDecodeError:
-                            break
-            
-            raise json.JSONDecodeError("All JSON parsing attempts failed", response_text, 0)
+            # Strip markdown code blocks, then take the first balanced JSON object
+            clean_text = _FENCE_RE.sub('', response_text)
+            parsed_json = json.loads(_extract_json_object(clean_text))
+            print(f"      ✅ JSON parsed successfully for {context}")
+            return parsed_json
                 
         except Exception as e:
             print(f"      ❌ All JSON parsing failed for {context}: {str(e)}")
@@ -766,10 +906,7 @@ Respond with comprehensive JSON analysis."""
             )
             
             # Collect response text
-            response_text = ""
-            for chunk in response_stream:
-                if chunk.text:
-                    response_text += chunk.text
+            response_text = _collect_stream_text(response_stream)
             
             return response_text.strip()
             
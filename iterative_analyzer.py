@@ -8,6 +8,7 @@ The ontology becomes more comprehensive and vertical-agnostic over time.
 import json
 import os
 import sys
+import threading
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from google import genai
@@ -53,6 +54,10 @@ class IterativeClipAnalyzer:
         self.brain_path = brain_path
         self.progress_callback = progress_callback
 
+        # Serializes reads and updates of the ontology/brain when one analyzer is shared
+        # across threads; the Gemini call itself runs outside it
+        self._state_lock = threading.Lock()
+
         # Load or create master ontology (from pickle)
         if os.path.exists(ontology_path):
             self.master_ontology = MasterClipOntology.load_binary(ontology_path)
@@ -213,7 +218,8 @@ OUTPUT ONLY VALID JSON.'''
         mime_type = mime_types.get(ext, 'video/mp4')
 
         # Build prompt with current ontology knowledge
-        prompt = self._build_analysis_prompt()
+        with self._state_lock:
+            prompt = self._build_analysis_prompt()
 
         # Send to Gemini
         print("Sending to Gemini for analysis...")
@@ -373,8 +379,8 @@ OUTPUT ONLY VALID JSON.'''
             )
             annotated_clips.append(annotated)
 
-            # Train the brain on this clip
-            self.brain.learn_from_clip(clip_data)
+        # Train the brain on these clips
+        self.brain.learn_video(clips)
 
         # Track sequence pattern
         sequence = [c.ontology.clip_function for c in annotated_clips if c.ontology.clip_function]
@@ -456,29 +462,30 @@ OUTPUT ONLY VALID JSON.'''
             self.progress_callback("Analyzing video with Gemini AI...", 40)
         analysis = self.analyze_video(video_path)
 
-        # Update ontology
-        if self.progress_callback:
-            self.progress_callback("Updating ontology...", 70)
-        annotated_clips = self.update_ontology(analysis)
-
-        # Generate output (text only)
-        if self.progress_callback:
-            self.progress_callback("Generating output files...", 85)
-        text_path = self.generate_output(
-            video_path, analysis, annotated_clips, output_dir
-        )
+        with self._state_lock:
+            # Update ontology
+            if self.progress_callback:
+                self.progress_callback("Updating ontology...", 70)
+            annotated_clips = self.update_ontology(analysis)
+
+            # Generate output (text only)
+            if self.progress_callback:
+                self.progress_callback("Generating output files...", 85)
+            text_path = self.generate_output(
+                video_path, analysis, annotated_clips, output_dir
+            )
 
-        # Save master ontology as text + binary
-        if self.progress_callback:
-            self.progress_callback("Saving ontology and brain...", 95)
-        ontology_text_path = self.ontology_path.replace('.pkl', '.txt')
-        self.master_ontology.save(ontology_text_path)
-        self.master_ontology.save_binary(self.ontology_path)
-
-        # Save brain as text
-        brain_text_path = self.brain_path.replace('.pkl', '.txt')
-        with open(brain_text_path, 'w') as f:
-            f.write(self.brain.to_text())
+            # Save master ontology as text + binary
+            if self.progress_callback:
+                self.progress_callback("Saving ontology and brain...", 95)
+            ontology_text_path = self.ontology_path.replace('.pkl', '.txt')
+            self.master_ontology.save(ontology_text_path)
+            self.master_ontology.save_binary(self.ontology_path)
+
+            # Save brain as text
+            brain_text_path = self.brain_path.replace('.pkl', '.txt')
+            with open(brain_text_path, 'w') as f:
+                f.write(self.brain.to_text())
 
         print(f"\n{'='*60}")
         print("COMPLETE")
@@ -6,13 +6,84 @@ Generates reports showing the current state of the clip ontology
 and how it has evolved across analyzed videos.
 """
 
+import io
 import json
 import os
 import sys
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, Any, List
-
-from clip_ontology_schema import MasterClipOntology
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from clip_ontology_schema import MasterClipOntology, OntologyCategory
+
+try:
+    import orjson
+except ImportError:  # optional - falls back to the stdlib encoder
+    orjson = None
+
+
+def _dumps(data: Any) -> str:
+    """Pretty-print data as JSON (2-space indent), using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2)
+
+# (value, frequency, percent of category occurrences, frequency bar)
+CategoryRow = Tuple[str, int, float, str]
+
+# Write buffer for report output; large reports go out in a few big writes
+_OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Longest bars the report draws; individual bars are slices of these
+_FULL_BAR = "█" * 50
+_SHADE_BAR = "▓" * 50
+
+# Section separators and the header box
+_SEP_EQ70 = "=" * 70
+_SEP_EQ50 = "=" * 50
+_SEP_DASH70 = "-" * 70
+_SEP_DASH40 = "-" * 40
+_HEADER_TOP = "╔" + "═" * 68 + "╗"
+_HEADER_BOT = "╚" + "═" * 68 + "╝"
+
+# (report title, MasterClipOntology attribute, description) for every category the
+# reports cover. Attributes an ontology doesn't have (older/newer schema) are skipped.
+_REPORT_CATEGORIES = (
+    ("SHOT TYPES", "shot_types", "How the camera frames the subject"),
+    ("CAMERA ANGLES", "camera_angles", "Camera height/position relative to subject"),
+    ("CAMERA MOVEMENTS", "camera_movements", "How the camera moves during the clip"),
+    ("COMPOSITIONS", "compositions", "How elements are arranged in frame"),
+    ("SETTING TYPES", "setting_types", "Types of environments/locations"),
+    ("LIGHTING STYLES", "lighting_styles", "Lighting approaches"),
+    ("COLOR MOODS", "color_moods", "Overall color/mood palettes"),
+    ("SUBJECT TYPES", "subject_types", "What the clip focuses on"),
+    ("SUBJECT ACTIONS", "subject_actions", "What subjects do in clips"),
+    ("TEXT PURPOSES", "text_purposes", "Why text appears on screen"),
+    ("SPEAKER TYPES", "speaker_types", "Who is speaking"),
+    ("VOCAL TONES", "vocal_tones", "Tone of voice delivery"),
+    ("VOCAL PACINGS", "vocal_pacings", "Speed of speech"),
+    ("MUSIC STYLES", "music_styles", "Types of background music"),
+    ("EMOTIONS", "emotions", "Emotions evoked by clips"),
+    ("EMOTIONAL INTENSITIES", "emotional_intensities", "How strong the emotion"),
+    ("CLIP FUNCTIONS", "clip_functions", "Role of clip in ad structure"),
+    ("NARRATIVE ROLES", "narrative_roles", "Role in story arc"),
+    ("PERSUASION MECHANISMS", "persuasion_mechanisms", "Psychological techniques"),
+    ("TRANSITION TYPES", "transition_types", "How clips connect"),
+)
+
+
+@lru_cache(maxsize=1)
+def _format_timestamp(epoch_second: int) -> str:
+    return datetime.fromtimestamp(epoch_second).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _report_timestamp() -> str:
+    """Footer timestamp; reports generated within the same second share one formatted string."""
+    return _format_timestamp(int(time.time()))
 
 
 class OntologyReporter:
@@ -26,141 +97,140 @@ class OntologyReporter:
 
         self.ontology = MasterClipOntology.load(ontology_path)
 
+        # Category name -> report rows sorted by frequency; the reporter never mutates the ontology
+        self._sorted_cache: Dict[str, Tuple[CategoryRow, ...]] = {}
+
+        # (ontology file mtime, serialized JSON export)
+        self._json_cache: Optional[Tuple[float, str]] = None
+
+    def _populated_categories(self) -> List[Tuple[str, str, str, OntologyCategory]]:
+        """(title, attribute, description, category) for every report category that has values."""
+        o = self.ontology
+        populated = []
+        for title, attr, description in _REPORT_CATEGORIES:
+            category = getattr(o, attr, None)
+            if category is not None and category.values:
+                populated.append((title, attr, description, category))
+        return populated
+
+    def _sorted_category(self, category: OntologyCategory) -> Tuple[CategoryRow, ...]:
+        """(value, frequency, percent, bar) rows of a category, most frequent first.
+
+        Built once per category and shared by every report format.
+        """
+        rows = self._sorted_cache.get(category.name)
+        if rows is None:
+            freq_map = category.frequency
+            items = [(value, freq_map.get(value, 0)) for value in category.values]
+            items.sort(key=itemgetter(1), reverse=True)
+
+            total_occurrences = sum(freq for _, freq in items)
+            pct_per_occurrence = (100.0 / total_occurrences) if total_occurrences > 0 else 0.0
+            bar_divisor = total_occurrences or 1  # every freq is 0 when the total is
+
+            rows = self._sorted_cache[category.name] = tuple(
+                # 50 char max bar, integer math
+                (value, freq, freq * pct_per_occurrence, _FULL_BAR[:freq * 50 // bar_divisor])
+                for value, freq in items
+            )
+        return rows
+
     def generate_full_report(self) -> str:
         """Generate comprehensive text report of the ontology."""
-        lines = []
-        o = self.ontology
+        return "\n".join(self.iter_full_report())
 
-        lines.append("╔" + "═" * 68 + "╗")
-        lines.append("║" + " MASTER CLIP ONTOLOGY REPORT ".center(68) + "║")
-        lines.append("╚" + "═" * 68 + "╝")
-        lines.append("")
+    def iter_full_report(self) -> Iterator[str]:
+        """Yield the lines of the full report one at a time, so it can be written without building it in memory."""
+        o = self.ontology
 
-        # Metadata
-        lines.append("METADATA")
-        lines.append("-" * 40)
-        lines.append(f"Version: {o.version}")
-        lines.append(f"Created: {o.created_at}")
-        lines.append(f"Last Updated: {o.updated_at}")
-        lines.append(f"Videos Analyzed: {o.videos_analyzed}")
-        lines.append(f"Total Clips Analyzed: {o.total_clips_analyzed}")
+        yield from [
+            _HEADER_TOP,
+            "║" + " MASTER CLIP ONTOLOGY REPORT ".center(68) + "║",
+            _HEADER_BOT,
+            "",
+            # Metadata
+            "METADATA",
+            _SEP_DASH40,
+            f"Version: {o.version}",
+            f"Created: {o.created_at}",
+            f"Last Updated: {o.updated_at}",
+            f"Videos Analyzed: {o.videos_analyzed}",
+            f"Total Clips Analyzed: {o.total_clips_analyzed}",
+        ]
         if o.videos_analyzed > 0:
             avg_clips = o.total_clips_analyzed / o.videos_analyzed
-            lines.append(f"Average Clips per Video: {avg_clips:.1f}")
-        lines.append("")
+            yield f"Average Clips per Video: {avg_clips:.1f}"
+        yield ""
 
         # Category summaries
-        categories = [
-            ("SHOT TYPES", o.shot_types, "How the camera frames the subject"),
-            ("CAMERA ANGLES", o.camera_angles, "Camera height/position relative to subject"),
-            ("CAMERA MOVEMENTS", o.camera_movements, "How the camera moves during the clip"),
-            ("COMPOSITIONS", o.compositions, "How elements are arranged in frame"),
-            ("SETTING TYPES", o.setting_types, "Types of environments/locations"),
-            ("LIGHTING STYLES", o.lighting_styles, "Lighting approaches"),
-            ("COLOR MOODS", o.color_moods, "Overall color/mood palettes"),
-            ("SUBJECT TYPES", o.subject_types, "What the clip focuses on"),
-            ("SUBJECT ACTIONS", o.subject_actions, "What subjects do in clips"),
-            ("TEXT PURPOSES", o.text_purposes, "Why text appears on screen"),
-            ("SPEAKER TYPES", o.speaker_types, "Who is speaking"),
-            ("VOCAL TONES", o.vocal_tones, "Tone of voice delivery"),
-            ("VOCAL PACINGS", o.vocal_pacings, "Speed of speech"),
-            ("MUSIC STYLES", o.music_styles, "Types of background music"),
-            ("EMOTIONS", o.emotions, "Emotions evoked by clips"),
-            ("EMOTIONAL INTENSITIES", o.emotional_intensities, "How strong the emotion"),
-            ("CLIP FUNCTIONS", o.clip_functions, "Role of clip in ad structure"),
-            ("NARRATIVE ROLES", o.narrative_roles, "Role in story arc"),
-            ("PERSUASION MECHANISMS", o.persuasion_mechanisms, "Psychological techniques"),
-            ("TRANSITION TYPES", o.transition_types, "How clips connect"),
-        ]
-
-        for title, category, description in categories:
-            if category.values:
-                lines.append("=" * 70)
-                lines.append(title)
-                lines.append(f"({description})")
-                lines.append("-" * 70)
-
-                # Sort by frequency
-                sorted_vals = sorted(
-                    category.values,
-                    key=lambda v: category.frequency.get(v, 0),
-                    reverse=True
-                )
-
-                total_occurrences = sum(category.frequency.values())
+        for title, attr, description, category in self._populated_categories():
+            yield from [_SEP_EQ70, title, f"({description})", _SEP_DASH70]
 
-                for value in sorted_vals:
-                    freq = category.frequency.get(value, 0)
-                    pct = (freq / total_occurrences * 100) if total_occurrences > 0 else 0
-                    bar_len = int(pct / 2)  # 50 char max bar
-                    bar = "█" * bar_len
+            # Descriptions if available (not every ontology version records them)
+            descriptions = getattr(category, 'value_descriptions', None) or {}
 
-                    # Description if available
-                    desc = category.value_descriptions.get(value, "")
-                    desc_str = f" - {desc}" if desc else ""
+            for value, freq, pct, bar in self._sorted_category(category):
+                desc = descriptions.get(value)
+                desc_str = f" - {desc}" if desc else ""
 
-                    lines.append(f"  {value}")
-                    lines.append(f"    {bar} {freq}x ({pct:.1f}%){desc_str}")
+                yield f"  {value}\n    {bar} {freq}x ({pct:.1f}%){desc_str}"
 
-                lines.append("")
+            yield ""
 
         # Function duration averages
         if o.function_duration_averages:
-            lines.append("=" * 70)
-            lines.append("CLIP FUNCTION DURATION AVERAGES")
-            lines.append("-" * 70)
+            yield from [_SEP_EQ70, "CLIP FUNCTION DURATION AVERAGES", _SEP_DASH70]
 
-            sorted_funcs = sorted(
-                o.function_duration_averages.items(),
-                key=lambda x: x[1]
-            )
+            sorted_funcs = sorted(o.function_duration_averages.items(), key=itemgetter(1))
 
             for func, avg_dur in sorted_funcs:
                 bar_len = int(avg_dur * 5)  # 5 chars per second
-                bar = "▓" * min(bar_len, 50)
-                lines.append(f"  {func}: {bar} {avg_dur:.2f}s")
+                bar = _SHADE_BAR[:bar_len]
+                yield f"  {func}: {bar} {avg_dur:.2f}s"
 
-            lines.append("")
+            yield ""
 
         # Emotion-function correlations
         if o.emotion_function_correlations:
-            lines.append("=" * 70)
-            lines.append("EMOTION-FUNCTION CORRELATIONS")
-            lines.append("(Which emotions are triggered by which clip functions)")
-            lines.append("-" * 70)
+            yield from [
+                _SEP_EQ70,
+                "EMOTION-FUNCTION CORRELATIONS",
+                "(Which emotions are triggered by which clip functions)",
+                _SEP_DASH70,
+            ]
 
             for func, emotions in sorted(o.emotion_function_correlations.items()):
-                top_emotions = sorted(emotions.items(), key=lambda x: -x[1])[:3]
+                top_emotions = nlargest(3, emotions.items(), key=itemgetter(1))
                 emotion_str = ", ".join([f"{e}({c})" for e, c in top_emotions])
-                lines.append(f"  {func}: {emotion_str}")
+                yield f"  {func}: {emotion_str}"
 
-            lines.append("")
+            yield ""
 
         # Common sequences
         if o.common_sequences:
-            lines.append("=" * 70)
-            lines.append("COMMON CLIP FUNCTION SEQUENCES")
-            lines.append("(How clips are typically ordered)")
-            lines.append("-" * 70)
+            yield from [
+                _SEP_EQ70,
+                "COMMON CLIP FUNCTION SEQUENCES",
+                "(How clips are typically ordered)",
+                _SEP_DASH70,
+            ]
 
             # Find most common starting sequences (first 5 functions)
-            seq_counts: Dict[str, int] = {}
-            for seq in o.common_sequences[-100:]:  # Last 100 sequences
-                key = " → ".join(seq[:5])
-                seq_counts[key] = seq_counts.get(key, 0) + 1
-
-            sorted_seqs = sorted(seq_counts.items(), key=lambda x: -x[1])[:10]
+            seq_counts = Counter(
+                " → ".join(seq[:5]) for seq in o.common_sequences[-100:]  # Last 100 sequences
+            )
 
-            for seq, count in sorted_seqs:
-                lines.append(f"  ({count}x) {seq}")
+            sorted_seqs = seq_counts.most_common(10)
 
-            lines.append("")
+            yield from (f"  ({count}x) {seq}" for seq, count in sorted_seqs)
 
-        lines.append("=" * 70)
-        lines.append(f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("=" * 70)
+            yield ""
 
-        return "\n".join(lines)
+        yield from [
+            _SEP_EQ70,
+            f"Report generated: {_report_timestamp()}",
+            _SEP_EQ70,
+        ]
 
     def generate_category_values(self) -> str:
         """Generate a simple list of all known values per category."""
@@ -168,42 +238,14 @@ class OntologyReporter:
         o = self.ontology
 
         lines.append("CLIP ONTOLOGY - KNOWN VALUES")
-        lines.append("=" * 50)
+        lines.append(_SEP_EQ50)
         lines.append("")
 
-        categories = [
-            ("shot_types", o.shot_types),
-            ("camera_angles", o.camera_angles),
-            ("camera_movements", o.camera_movements),
-            ("compositions", o.compositions),
-            ("setting_types", o.setting_types),
-            ("lighting_styles", o.lighting_styles),
-            ("color_moods", o.color_moods),
-            ("subject_types", o.subject_types),
-            ("subject_actions", o.subject_actions),
-            ("text_purposes", o.text_purposes),
-            ("speaker_types", o.speaker_types),
-            ("vocal_tones", o.vocal_tones),
-            ("vocal_pacings", o.vocal_pacings),
-            ("music_styles", o.music_styles),
-            ("emotions", o.emotions),
-            ("emotional_intensities", o.emotional_intensities),
-            ("clip_functions", o.clip_functions),
-            ("narrative_roles", o.narrative_roles),
-            ("persuasion_mechanisms", o.persuasion_mechanisms),
-            ("transition_types", o.transition_types),
-        ]
-
-        for name, category in categories:
-            if category.values:
-                sorted_vals = sorted(
-                    category.values,
-                    key=lambda v: category.frequency.get(v, 0),
-                    reverse=True
-                )
-                lines.append(f"{name}:")
-                lines.append(f"  {', '.join(sorted_vals)}")
-                lines.append("")
+        for _, name, _, category in self._populated_categories():
+            sorted_vals = [row[0] for row in self._sorted_category(category)]
+            lines.append(f"{name}:")
+            lines.append(f"  {', '.join(sorted_vals)}")
+            lines.append("")
 
         return "\n".join(lines)
 
@@ -211,26 +253,24 @@ class OntologyReporter:
         """Export ontology as JSON for external use."""
         return self.ontology.to_dict()
 
+    def generate_json_text(self) -> str:
+        """JSON export as text, reused until the ontology file is modified."""
+        mtime = os.path.getmtime(self.ontology_path)
+        if self._json_cache is None or self._json_cache[0] != mtime:
+            if self._json_cache is not None:
+                # File changed since the last export - reload before serializing
+                self.ontology = MasterClipOntology.load(self.ontology_path)
+                self._sorted_cache.clear()
+            self._json_cache = (mtime, _dumps(self.generate_json_export()))
+        return self._json_cache[1]
+
     def get_stats(self) -> dict:
         """Get quick statistics about the ontology."""
         o = self.ontology
 
-        total_categories = 0
-        total_values = 0
-
-        categories = [
-            o.shot_types, o.camera_angles, o.camera_movements, o.compositions,
-            o.setting_types, o.lighting_styles, o.color_moods, o.subject_types,
-            o.subject_actions, o.text_purposes, o.speaker_types, o.vocal_tones,
-            o.vocal_pacings, o.music_styles, o.emotions, o.emotional_intensities,
-            o.clip_functions, o.narrative_roles, o.persuasion_mechanisms,
-            o.transition_types
-        ]
-
-        for cat in categories:
-            if cat.values:
-                total_categories += 1
-                total_values += len(cat.values)
+        populated = [category.values for _, _, _, category in self._populated_categories()]
+        total_categories = len(populated)
+        total_values = sum(map(len, populated))
 
         return {
             "videos_analyzed": o.videos_analyzed,
@@ -281,24 +321,39 @@ def main():
         print(f"Error: {e}")
         sys.exit(1)
 
-    # Generate report
+    # Generate report (the full report is streamed line by line)
+    lines: Iterable[str]
     if args.format == 'full':
-        output = reporter.generate_full_report()
+        lines = reporter.iter_full_report()
     elif args.format == 'values':
-        output = reporter.generate_category_values()
+        lines = [reporter.generate_category_values()]
     elif args.format == 'stats':
         stats = reporter.get_stats()
-        output = json.dumps(stats, indent=2)
+        lines = [_dumps(stats)]
     elif args.format == 'json':
-        output = json.dumps(reporter.generate_json_export(), indent=2)
+        lines = [reporter.generate_json_text()]
 
     # Output
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            f.write(output)
+        with open(args.output, 'w', encoding='utf-8', buffering=_OUTPUT_BUFFER_SIZE) as f:
+            f.writelines(f"{line}\n" for line in lines)
         print(f"Report saved to: {args.output}")
     else:
-        print(output)
+        buffer = getattr(sys.stdout, 'buffer', None)
+        if buffer is None:
+            # Text-only stream (e.g. StringIO) - write through it directly
+            sys.stdout.writelines(f"{line}\n" for line in lines)
+            sys.stdout.flush()
+        else:
+            # Encode through one wrapper on stdout's byte buffer, in the console's encoding
+            sys.stdout.flush()
+            out = io.TextIOWrapper(buffer, encoding=sys.stdout.encoding,
+                                   errors=sys.stdout.errors)
+            try:
+                out.writelines(f"{line}\n" for line in lines)
+                out.flush()
+            finally:
+                out.detach()  # Leave sys.stdout's buffer open
 
 
 if __name__ == "__main__":
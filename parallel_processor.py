@@ -6,16 +6,24 @@ Splits videos into 40-second chunks, processes each in parallel threads,
 then assembles results with proper timestamp offsets.
 """
 
+import csv
 import os
+import queue
+import re
 import sys
 import subprocess
 import tempfile
 import shutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import repeat
+from operator import attrgetter
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 import threading
+import logging
+from logging.handlers import QueueHandler, QueueListener
 
 from config import Config
 from clip_ontology_schema import ClipOntology, MasterClipOntology, AnnotatedClip
@@ -24,6 +32,41 @@ from iterative_analyzer import IterativeClipAnalyzer
 
 CHUNK_DURATION = 40  # seconds
 
+# Progress from worker threads. By default it goes straight to stdout (see
+# _stdout_handler below); main() routes it through a queue so workers only
+# enqueue records and a single thread writes them. Replace log's handlers to
+# send progress elsewhere when using this module as a library.
+log = logging.getLogger(__name__)
+
+# Listener draining the queue while main() runs, see _drain_log
+_log_listener: Optional[QueueListener] = None
+
+# Chunks are written once and read straight back by the analyzer, so keep them
+# on tmpfs when the host has one with room to spare (see chunk_temp_root)
+SHM_DIR = '/dev/shm'
+
+# Section separator for the per-video ontology text output
+_SEP70 = "=" * 70
+_CLIPS_HEADER = f"\n\n{_SEP70}\nCLIP-BY-CLIP ONTOLOGY\n{_SEP70}\n"
+
+# Write buffer for the per-video ontology text output
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Trailing chunks shorter than this are merged into the previous chunk
+MIN_TAIL_SECONDS = 10
+
+# Quiet, non-interactive ffmpeg prefix: only errors reach stderr
+FFMPEG_BASE = ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y']
+
+# [HH:]MM:SS[.mmm] as returned by the analyzer, tolerating a trailing "s"
+_TIMESTAMP_RE = re.compile(r'\s*(?:(\d+):)?(\d+):(\d+(?:\.\d*)?)\s*s?\s*$')
+
+# Shared by every chunk worker, however many video/chunk pools are running
+_gemini_slots = threading.BoundedSemaphore(Config.GEMINI_MAX_CONCURRENT_REQUESTS)
+
+# Per-thread IterativeClipAnalyzer (and its Gemini client), see _thread_analyzer
+_thread_state = threading.local()
+
 
 @dataclass
 class VideoChunk:
@@ -45,6 +88,48 @@ class ChunkResult:
     error: Optional[str] = None
 
 
+def _stdout_handler() -> logging.Handler:
+    """Plain message-only stdout handler, matching the processor's print output."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+# Library default (and worker processes, which re-import this module): progress
+# is written to stdout as it was when it was printed
+log.addHandler(_stdout_handler())
+log.setLevel(logging.INFO)
+log.propagate = False
+
+
+def _start_log_listener() -> QueueListener:
+    """Send this module's log records through a queue drained by one listener thread."""
+    global _log_listener
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *log.handlers)
+    log.handlers[:] = [QueueHandler(log_queue)]
+    listener.start()
+    _log_listener = listener
+    return listener
+
+
+def _stop_log_listener():
+    """Flush the queue and hand the listener's handlers back to log."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        log.handlers[:] = list(_log_listener.handlers)
+        _log_listener = None
+
+
+def _drain_log():
+    """Write out every queued progress record before this thread prints to stdout."""
+    if _log_listener is not None:
+        # stop() processes the queue up to its sentinel; start() picks up again
+        _log_listener.stop()
+        _log_listener.start()
+
+
 def get_video_duration(video_path: str) -> float:
     """Get video duration in seconds using ffprobe."""
     cmd = [
@@ -60,30 +145,150 @@ def get_video_duration(video_path: str) -> float:
         raise RuntimeError(f"Could not get video duration: {e}")
 
 
+def _run_ffmpeg(cmd: List[str]):
+    """Run ffmpeg, keeping only its (error-level) stderr for CalledProcessError."""
+    subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                   stderr=subprocess.PIPE, check=True)
+
+
+def _probe_duration_or_none(video_path: str) -> Optional[float]:
+    try:
+        return get_video_duration(video_path)
+    except RuntimeError:
+        return None
+
+
+def probe_durations(video_paths: List[str], max_workers: int = 8) -> Dict[str, Optional[float]]:
+    """
+    Probe all videos concurrently, up front.
+    Videos that can't be probed map to None (the worker re-probes and reports the error).
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(video_paths, executor.map(_probe_duration_or_none, video_paths)))
+
+
+def chunk_temp_root(expected_bytes: int) -> Optional[str]:
+    """
+    Directory to create chunk temp dirs in: SHM_DIR when it is writable and has
+    twice expected_bytes free (re-encoded chunks can outgrow the source, and other
+    processes share the tmpfs), otherwise None - the system temp directory on disk.
+    """
+    if not os.access(SHM_DIR, os.W_OK):
+        return None
+    try:
+        free = shutil.disk_usage(SHM_DIR).free
+    except OSError:
+        return None
+    return SHM_DIR if free >= 2 * expected_bytes else None
+
+
 def split_video_into_chunks(
     video_path: str,
     chunk_duration: int = CHUNK_DURATION,
-    output_dir: str = None
+    output_dir: str = None,
+    total_duration: Optional[float] = None
 ) -> List[VideoChunk]:
     """
     Split video into chunks of specified duration.
+    Pass total_duration if the video has already been probed.
     Returns list of VideoChunk objects.
     """
     if output_dir is None:
-        output_dir = tempfile.mkdtemp(prefix="video_chunks_")
+        output_dir = tempfile.mkdtemp(
+            prefix="video_chunks_", dir=chunk_temp_root(os.path.getsize(video_path))
+        )
+
+    if total_duration is None:
+        total_duration = get_video_duration(video_path)
+
+    log.info(f"Splitting {total_duration:.1f}s video into {chunk_duration}s chunks...")
+
+    try:
+        chunks = _split_with_segment_muxer(video_path, chunk_duration, output_dir, total_duration)
+    except (subprocess.CalledProcessError, OSError, ValueError):
+        # Segment muxer couldn't stream-copy this input - extract chunk by chunk
+        chunks = _split_per_chunk(video_path, chunk_duration, output_dir, total_duration)
+
+    log.info(f"Created {len(chunks)} chunks")
+    return chunks
+
+
+def _split_points(total_duration: float, chunk_duration: int) -> List[float]:
+    """
+    Start times of every chunk after the first. A trailing remainder shorter
+    than MIN_TAIL_SECONDS (or a quarter chunk) is folded into the last chunk
+    rather than costing a Gemini request of its own.
+    """
+    min_tail = min(MIN_TAIL_SECONDS, chunk_duration / 4)
+    points = []
+    split_at = float(chunk_duration)
+    while total_duration - split_at >= min_tail:
+        points.append(split_at)
+        split_at += chunk_duration
+    return points
+
+
+def _split_with_segment_muxer(
+    video_path: str,
+    chunk_duration: int,
+    output_dir: str,
+    total_duration: float
+) -> List[VideoChunk]:
+    """
+    Split in a single ffmpeg pass using the segment muxer (stream copy).
+    Chunk offsets come from the segment list, since stream-copied segments
+    start on keyframes rather than exactly every chunk_duration seconds.
+    """
+    list_path = os.path.join(output_dir, 'chunks.csv')
+    # A single split point past the end yields one segment for short videos
+    points = _split_points(total_duration, chunk_duration) or [total_duration + chunk_duration]
+    cmd = [
+        *FFMPEG_BASE,
+        '-i', video_path,
+        '-c', 'copy',
+        '-f', 'segment',
+        '-segment_times', ','.join(f"{point:g}" for point in points),
+        '-segment_list', list_path,
+        '-segment_list_type', 'csv',
+        '-reset_timestamps', '1',
+        '-avoid_negative_ts', 'make_zero',
+        os.path.join(output_dir, 'chunk_%03d.mp4')
+    ]
+    _run_ffmpeg(cmd)
 
-    total_duration = get_video_duration(video_path)
     chunks = []
+    with open(list_path, newline='', encoding='utf-8') as f:
+        for chunk_index, (filename, start, end) in enumerate(csv.reader(f)):
+            start_offset = float(start)
+            chunks.append(VideoChunk(
+                chunk_index=chunk_index,
+                chunk_path=os.path.join(output_dir, os.path.basename(filename)),
+                start_offset=start_offset,
+                duration=float(end) - start_offset
+            ))
 
-    chunk_index = 0
-    current_time = 0.0
+    if not chunks:
+        raise ValueError("Segment muxer produced no chunks")
+    return chunks
 
-    print(f"Splitting {total_duration:.1f}s video into {chunk_duration}s chunks...")
 
-    while current_time < total_duration:
-        # Calculate this chunk's duration
-        remaining = total_duration - current_time
-        this_chunk_duration = min(chunk_duration, remaining)
+def _split_per_chunk(
+    video_path: str,
+    chunk_duration: int,
+    output_dir: str,
+    total_duration: float
+) -> List[VideoChunk]:
+    """Split by running one ffmpeg per chunk, re-encoding chunks that can't be copied."""
+    chunks = []
+    if total_duration <= 0:
+        return chunks
+
+    points = _split_points(total_duration, chunk_duration)
+    starts = [0.0] + points
+    ends = points + [total_duration]
+
+    for chunk_index, (current_time, end_time) in enumerate(zip(starts, ends)):
+        this_chunk_duration = end_time - current_time
 
         # Output path for this chunk
         chunk_filename = f"chunk_{chunk_index:03d}.mp4"
@@ -91,7 +296,7 @@ def split_video_into_chunks(
 
         # Use ffmpeg to extract chunk
         cmd = [
-            'ffmpeg', '-y',
+            *FFMPEG_BASE,
             '-ss', str(current_time),
             '-i', video_path,
             '-t', str(this_chunk_duration),
@@ -101,11 +306,11 @@ def split_video_into_chunks(
         ]
 
         try:
-            subprocess.run(cmd, capture_output=True, check=True)
+            _run_ffmpeg(cmd)
         except subprocess.CalledProcessError as e:
             # If copy fails, try with re-encoding
             cmd = [
-                'ffmpeg', '-y',
+                *FFMPEG_BASE,
                 '-ss', str(current_time),
                 '-i', video_path,
                 '-t', str(this_chunk_duration),
@@ -113,7 +318,7 @@ def split_video_into_chunks(
                 '-c:a', 'aac',
                 chunk_path
             ]
-            subprocess.run(cmd, capture_output=True, check=True)
+            _run_ffmpeg(cmd)
 
         chunks.append(VideoChunk(
             chunk_index=chunk_index,
@@ -122,32 +327,35 @@ def split_video_into_chunks(
             duration=this_chunk_duration
         ))
 
-        current_time += chunk_duration
-        chunk_index += 1
-
-    print(f"Created {len(chunks)} chunks")
     return chunks
 
 
 def add_time_offset(timestamp: str, offset_seconds: float) -> str:
-    """Add offset to MM:SS.mmm timestamp and return new timestamp."""
+    """Add offset to [HH:]MM:SS.mmm timestamp and return new MM:SS.mmm timestamp."""
     if not timestamp:
         return timestamp
 
-    try:
-        # Parse MM:SS.mmm or MM:SS
-        parts = timestamp.split(':')
-        minutes = int(parts[0])
-        seconds = float(parts[1])
+    # Parse [HH:]MM:SS.mmm or [HH:]MM:SS
+    match = _TIMESTAMP_RE.match(timestamp)
+    if not match:
+        log.warning(f"  Unparseable timestamp {timestamp!r}, left without the +{offset_seconds:g}s chunk offset")
+        return timestamp
 
-        total_seconds = minutes * 60 + seconds + offset_seconds
+    hours, minutes, seconds = match.groups()
+    total_seconds = (int(hours or 0) * 60 + int(minutes)) * 60 + float(seconds)
+    total_ms = round((total_seconds + offset_seconds) * 1000)
+    minutes, ms = divmod(total_ms, 60000)
+    return f"{minutes:02d}:{ms / 1000:06.3f}"
 
-        new_minutes = int(total_seconds // 60)
-        new_seconds = total_seconds % 60
 
-        return f"{new_minutes:02d}:{new_seconds:06.3f}"
-    except:
-        return timestamp
+def _thread_analyzer(model: str) -> IterativeClipAnalyzer:
+    """Return this thread's analyzer for model, creating it on first use."""
+    analyzer = getattr(_thread_state, 'analyzer', None)
+    if analyzer is None or _thread_state.model != model:
+        analyzer = IterativeClipAnalyzer(model=model)
+        _thread_state.analyzer = analyzer
+        _thread_state.model = model
+    return analyzer
 
 
 def process_single_chunk(
@@ -156,15 +364,16 @@ def process_single_chunk(
     thread_id: int = 0
 ) -> ChunkResult:
     """Process a single video chunk. Runs in a thread."""
-    print(f"  [Thread {thread_id}] Processing chunk {chunk.chunk_index} "
-          f"({chunk.start_offset:.1f}s - {chunk.start_offset + chunk.duration:.1f}s)")
+    log.info(f"  [Thread {thread_id}] Processing chunk {chunk.chunk_index} "
+             f"({chunk.start_offset:.1f}s - {chunk.start_offset + chunk.duration:.1f}s)")
 
     try:
-        # Create analyzer for this thread (each thread needs its own client)
-        analyzer = IterativeClipAnalyzer(model=model)
+        # Each thread needs its own client; reuse it across the chunks this thread runs
+        analyzer = _thread_analyzer(model)
 
-        # Analyze the chunk
-        analysis = analyzer.analyze_video(chunk.chunk_path)
+        # Analyze the chunk (waits for a free Gemini request slot)
+        with _gemini_slots:
+            analysis = analyzer.analyze_video(chunk.chunk_path)
 
         # Convert to annotated clips
         clips = []
@@ -188,7 +397,7 @@ def process_single_chunk(
 
         transcript = analysis.get('video_summary', {}).get('full_transcript', '')
 
-        print(f"  [Thread {thread_id}] Chunk {chunk.chunk_index} complete: {len(clips)} clips")
+        log.info(f"  [Thread {thread_id}] Chunk {chunk.chunk_index} complete: {len(clips)} clips")
 
         return ChunkResult(
             chunk_index=chunk.chunk_index,
@@ -199,7 +408,7 @@ def process_single_chunk(
         )
 
     except Exception as e:
-        print(f"  [Thread {thread_id}] Chunk {chunk.chunk_index} FAILED: {e}")
+        log.error(f"  [Thread {thread_id}] Chunk {chunk.chunk_index} FAILED: {e}")
         return ChunkResult(
             chunk_index=chunk.chunk_index,
             start_offset=chunk.start_offset,
@@ -216,7 +425,8 @@ def assemble_results(
 ) -> tuple:
     """
     Assemble chunk results into final ordered list.
-    Returns (annotated_clips, full_transcript).
+    Returns (annotated_clips, transcript_parts) - the parts are written
+    space-separated by write_ontology_report.
     """
     # Sort by chunk index
     sorted_results = sorted(chunk_results, key=lambda r: r.chunk_index)
@@ -239,9 +449,53 @@ def assemble_results(
         # Update master ontology
         master_ontology.update_from_clip(clip.ontology)
 
-    full_transcript = ' '.join(transcript_parts)
+    return all_clips, transcript_parts
 
-    return all_clips, full_transcript
+
+def write_ontology_report(
+    video_path: str,
+    annotated_clips: List[AnnotatedClip],
+    transcript_parts: List[str],
+    output_dir: str
+) -> str:
+    """
+    Write the per-video ontology text file and return its path.
+    transcript_parts (per-chunk transcripts, in order) are joined with spaces.
+    """
+    video_name = os.path.basename(video_path)
+    base_name = os.path.splitext(video_name)[0]
+    now = datetime.now()
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+    text_path = os.path.join(output_dir, f"{base_name}_ontology_{timestamp}.txt")
+
+    header = [
+        _SEP70,
+        "VIDEO CLIP ONTOLOGY ANALYSIS",
+        _SEP70,
+        f"Video: {video_name}",
+        f"Analyzed: {now.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Total Clips: {len(annotated_clips)}",
+        "",
+        _SEP70,
+        "FULL TRANSCRIPT",
+        _SEP70,
+    ]
+
+    # Stream transcript parts and clip blocks straight to the file instead of joining them first
+    with open(text_path, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.writelines(f"{line}\n" for line in header)
+        if transcript_parts:
+            for i, part in enumerate(transcript_parts):
+                if i:
+                    f.write(' ')
+                f.write(part)
+        else:
+            f.write('[No transcript]')
+        f.write(_CLIPS_HEADER)
+        f.writelines(f"{clip.to_text()}\n" for clip in annotated_clips)
+        f.write(_SEP70)
+
+    return text_path
 
 
 class ParallelVideoProcessor:
@@ -289,7 +543,9 @@ class ParallelVideoProcessor:
             output_dir = os.path.dirname(video_path) or '.'
 
         # Create temp directory for chunks
-        temp_dir = tempfile.mkdtemp(prefix="ontology_chunks_")
+        temp_dir = tempfile.mkdtemp(
+            prefix="ontology_chunks_", dir=chunk_temp_root(os.path.getsize(video_path))
+        )
 
         try:
             # Split video into chunks
@@ -301,40 +557,19 @@ class ParallelVideoProcessor:
 
             # Process chunks in parallel
             print(f"\nProcessing {len(chunks)} chunks with {self.max_workers} workers...")
-            chunk_results = []
-
+            # process_single_chunk reports failures as ChunkResults, so map yields every chunk
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all chunks
-                future_to_chunk = {
-                    executor.submit(
-                        process_single_chunk,
-                        chunk,
-                        self.model,
-                        i % self.max_workers
-                    ): chunk
-                    for i, chunk in enumerate(chunks)
-                }
-
-                # Collect results as they complete
-                for future in as_completed(future_to_chunk):
-                    chunk = future_to_chunk[future]
-                    try:
-                        result = future.result()
-                        chunk_results.append(result)
-                    except Exception as e:
-                        print(f"Chunk {chunk.chunk_index} exception: {e}")
-                        chunk_results.append(ChunkResult(
-                            chunk_index=chunk.chunk_index,
-                            start_offset=chunk.start_offset,
-                            clips=[],
-                            transcript='',
-                            success=False,
-                            error=str(e)
-                        ))
-
-            # Assemble results
+                chunk_results = list(executor.map(
+                    process_single_chunk,
+                    chunks,
+                    repeat(self.model),
+                    (i % self.max_workers for i in range(len(chunks)))
+                ))
+
+            # Assemble results (after the chunk workers' queued progress)
+            _drain_log()
             print("\nAssembling results...")
-            annotated_clips, full_transcript = assemble_results(
+            annotated_clips, transcript_parts = assemble_results(
                 chunk_results, self.master_ontology
             )
 
@@ -343,7 +578,7 @@ class ParallelVideoProcessor:
 
             # Generate output
             text_path = self._generate_output(
-                video_path, annotated_clips, full_transcript, output_dir
+                video_path, annotated_clips, transcript_parts, output_dir
             )
 
             # Save ontology
@@ -381,53 +616,46 @@ class ParallelVideoProcessor:
         self,
         video_path: str,
         annotated_clips: List[AnnotatedClip],
-        full_transcript: str,
+        transcript_parts: List[str],
         output_dir: str
     ) -> str:
         """Generate text output file."""
-        base_name = os.path.splitext(os.path.basename(video_path))[0]
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        text_path = os.path.join(output_dir, f"{base_name}_ontology_{timestamp}.txt")
-
-        lines = []
-        lines.append("=" * 70)
-        lines.append("VIDEO CLIP ONTOLOGY ANALYSIS")
-        lines.append("=" * 70)
-        lines.append(f"Video: {os.path.basename(video_path)}")
-        lines.append(f"Analyzed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append(f"Total Clips: {len(annotated_clips)}")
-        lines.append("")
+        return write_ontology_report(video_path, annotated_clips, transcript_parts, output_dir)
 
-        lines.append("=" * 70)
-        lines.append("FULL TRANSCRIPT")
-        lines.append("=" * 70)
-        lines.append(full_transcript or '[No transcript]')
-        lines.append("")
 
-        lines.append("=" * 70)
-        lines.append("CLIP-BY-CLIP ONTOLOGY")
-        lines.append("=" * 70)
+# ClipOntology fields exported per section in each video's clip_data
+_VISUAL_FIELDS = (
+    'shot_type', 'camera_angle', 'camera_movement', 'subject_type', 'subject_action',
+    'setting_type', 'lighting_style', 'color_mood', 'text_purpose',
+    'subject_description', 'setting_description', 'text_on_screen',
+)
+_EMOTIONAL_FIELDS = ('primary_emotion', 'secondary_emotion', 'emotional_intensity')
+_FUNCTIONAL_FIELDS = ('clip_function', 'narrative_role', 'persuasion_mechanism')
+_visual_values = attrgetter(*_VISUAL_FIELDS)
+_emotional_values = attrgetter(*_EMOTIONAL_FIELDS)
+_functional_values = attrgetter(*_FUNCTIONAL_FIELDS)
 
-        for clip in annotated_clips:
-            lines.append(clip.to_text())
 
-        lines.append("=" * 70)
-
-        with open(text_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
-
-        return text_path
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.webm', '.avi', '.mkv'}
 
 
 def find_videos(directory: str) -> List[str]:
     """Find all video files in directory."""
-    import glob
-    extensions = ['.mp4', '.mov', '.webm', '.avi', '.mkv']
-    videos = []
-    for ext in extensions:
-        videos.extend(glob.glob(os.path.join(directory, f'*{ext}')))
-        videos.extend(glob.glob(os.path.join(directory, f'*{ext.upper()}')))
-    return sorted(list(set(videos)))
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS
+        )
+
+
+def _clear_dir(path: str):
+    """Delete the files in path, keeping the directory itself."""
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
 
 
 def process_single_video_standalone(
@@ -436,66 +664,62 @@ def process_single_video_standalone(
     model: str,
     chunk_duration: int,
     video_index: int,
-    total_videos: int
+    total_videos: int,
+    chunk_pool: Optional[ThreadPoolExecutor] = None,
+    chunk_dirs: Optional["queue.Queue[str]"] = None,
+    total_duration: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Process a single video completely (with internal chunk parallelization).
     This function is called in parallel for multiple videos.
+    Chunks are submitted to chunk_pool when given (shared across videos),
+    otherwise to a private 4-worker pool. Chunk files go in a directory
+    borrowed from chunk_dirs when given, otherwise in a fresh temp directory.
+    total_duration skips the ffprobe call when the video was already probed.
     Returns results dict for later aggregation.
     """
     video_name = os.path.basename(video_path)
-    print(f"\n[Video {video_index}/{total_videos}] START: {video_name}")
+    log.info(f"\n[Video {video_index}/{total_videos}] START: {video_name}")
 
     try:
         # Get video duration and split into chunks
-        total_duration = get_video_duration(video_path)
+        if total_duration is None:
+            total_duration = get_video_duration(video_path)
 
-        # Create temp directory for this video's chunks
-        temp_dir = tempfile.mkdtemp(prefix=f"chunks_{video_index}_")
+        # Borrow a pooled chunk directory, or create one for this video's chunks
+        if chunk_dirs is not None:
+            temp_dir = chunk_dirs.get()
+        else:
+            temp_dir = tempfile.mkdtemp(
+                prefix=f"chunks_{video_index}_", dir=chunk_temp_root(os.path.getsize(video_path))
+            )
 
         try:
             # Split video
-            chunks = split_video_into_chunks(video_path, chunk_duration, temp_dir)
-            print(f"[Video {video_index}] Split into {len(chunks)} chunks")
+            chunks = split_video_into_chunks(video_path, chunk_duration, temp_dir, total_duration)
+            log.info(f"[Video {video_index}] Split into {len(chunks)} chunks")
 
             # Process chunks in parallel (within this video)
-            chunk_results = []
-            with ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_chunk = {
-                    executor.submit(
-                        process_single_chunk,
-                        chunk,
-                        model,
-                        video_index * 100 + i  # Unique thread ID
-                    ): chunk
-                    for i, chunk in enumerate(chunks)
-                }
-
-                for future in as_completed(future_to_chunk):
-                    chunk = future_to_chunk[future]
-                    try:
-                        result = future.result()
-                        chunk_results.append(result)
-                    except Exception as e:
-                        print(f"[Video {video_index}] Chunk {chunk.chunk_index} failed: {e}")
-                        chunk_results.append(ChunkResult(
-                            chunk_index=chunk.chunk_index,
-                            start_offset=chunk.start_offset,
-                            clips=[],
-                            transcript='',
-                            success=False,
-                            error=str(e)
-                        ))
-
-            # Sort results by chunk index
-            sorted_results = sorted(chunk_results, key=lambda r: r.chunk_index)
+            # Results come back in chunk order; failures are returned as ChunkResults
+            own_pool = chunk_pool is None
+            executor = ThreadPoolExecutor(max_workers=4) if own_pool else chunk_pool
+            try:
+                chunk_results = list(executor.map(
+                    process_single_chunk,
+                    chunks,
+                    repeat(model),
+                    (video_index * 100 + i for i in range(len(chunks)))  # Unique thread ID
+                ))
+            finally:
+                if own_pool:
+                    executor.shutdown()
 
             # Collect all clips and transcripts
             all_clips = []
             transcript_parts = []
             all_clip_data = []
 
-            for result in sorted_results:
+            for result in chunk_results:
                 if result.success:
                     all_clips.extend(result.clips)
                     if result.transcript:
@@ -506,74 +730,25 @@ def process_single_video_standalone(
             # Renumber clips and build clip data
             for i, clip in enumerate(all_clips, 1):
                 clip.clip_number = i
+                o = clip.ontology
                 clip_data = {
-                    'visual': {
-                        'shot_type': clip.ontology.shot_type,
-                        'camera_angle': clip.ontology.camera_angle,
-                        'camera_movement': clip.ontology.camera_movement,
-                        'subject_type': clip.ontology.subject_type,
-                        'subject_action': clip.ontology.subject_action,
-                        'setting_type': clip.ontology.setting_type,
-                        'lighting_style': clip.ontology.lighting_style,
-                        'color_mood': clip.ontology.color_mood,
-                        'text_purpose': clip.ontology.text_purpose,
-                        'subject_description': clip.ontology.subject_description,
-                        'setting_description': clip.ontology.setting_description,
-                        'text_on_screen': clip.ontology.text_on_screen,
-                    },
-                    'emotional': {
-                        'primary_emotion': clip.ontology.primary_emotion,
-                        'secondary_emotion': clip.ontology.secondary_emotion,
-                        'emotional_intensity': clip.ontology.emotional_intensity,
-                    },
-                    'functional': {
-                        'clip_function': clip.ontology.clip_function,
-                        'narrative_role': clip.ontology.narrative_role,
-                        'persuasion_mechanism': clip.ontology.persuasion_mechanism,
-                    },
-                    'script_segment': clip.ontology.script_segment,
-                    'duration_seconds': clip.ontology.duration_seconds,
+                    'visual': dict(zip(_VISUAL_FIELDS, _visual_values(o))),
+                    'emotional': dict(zip(_EMOTIONAL_FIELDS, _emotional_values(o))),
+                    'functional': dict(zip(_FUNCTIONAL_FIELDS, _functional_values(o))),
+                    'script_segment': o.script_segment,
+                    'duration_seconds': o.duration_seconds,
                 }
                 all_clip_data.append(clip_data)
 
-            full_transcript = ' '.join(transcript_parts)
-
             # Generate output file
             if output_dir is None:
                 output_dir = os.path.dirname(video_path) or '.'
 
-            base_name = os.path.splitext(os.path.basename(video_path))[0]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            text_path = os.path.join(output_dir, f"{base_name}_ontology_{timestamp}.txt")
-
-            lines = []
-            lines.append("=" * 70)
-            lines.append("VIDEO CLIP ONTOLOGY ANALYSIS")
-            lines.append("=" * 70)
-            lines.append(f"Video: {os.path.basename(video_path)}")
-            lines.append(f"Analyzed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            lines.append(f"Total Clips: {len(all_clips)}")
-            lines.append("")
-            lines.append("=" * 70)
-            lines.append("FULL TRANSCRIPT")
-            lines.append("=" * 70)
-            lines.append(full_transcript or '[No transcript]')
-            lines.append("")
-            lines.append("=" * 70)
-            lines.append("CLIP-BY-CLIP ONTOLOGY")
-            lines.append("=" * 70)
-
-            for clip in all_clips:
-                lines.append(clip.to_text())
-
-            lines.append("=" * 70)
-
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+            text_path = write_ontology_report(video_path, all_clips, transcript_parts, output_dir)
 
             successful_chunks = sum(1 for r in chunk_results if r.success)
-            print(f"[Video {video_index}/{total_videos}] DONE: {video_name} - "
-                  f"{len(all_clips)} clips, {successful_chunks}/{len(chunks)} chunks OK")
+            log.info(f"[Video {video_index}/{total_videos}] DONE: {video_name} - "
+                     f"{len(all_clips)} clips, {successful_chunks}/{len(chunks)} chunks OK")
 
             return {
                 'video': video_path,
@@ -587,12 +762,16 @@ def process_single_video_standalone(
             }
 
         finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            if chunk_dirs is not None:
+                # Empty the slot first - a shorter next video would leave the
+                # extra chunks resident until the batch ends
+                _clear_dir(temp_dir)
+                chunk_dirs.put(temp_dir)
+            else:
+                shutil.rmtree(temp_dir, ignore_errors=True)
 
     except Exception as e:
-        print(f"[Video {video_index}/{total_videos}] FAILED: {video_name} - {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"[Video {video_index}/{total_videos}] FAILED: {video_name} - {e}")
         return {
             'video': video_path,
             'success': False,
@@ -609,11 +788,14 @@ def process_directory_parallel(
     ontology_path: str = "master_clip_ontology.pkl",
     max_video_workers: int = 3,
     chunk_duration: int = CHUNK_DURATION,
-    synthesize_brain: bool = True
+    synthesize_brain: bool = True,
+    use_processes: bool = False
 ):
     """
     Process all videos in a directory in parallel.
     Each video is processed in parallel, and chunks within each video are also parallel.
+    With use_processes, videos run in separate worker processes (each with its
+    own chunk pool) so clip conversion and report formatting aren't GIL-bound.
     """
     videos = find_videos(video_dir)
     if not videos:
@@ -628,76 +810,116 @@ def process_directory_parallel(
     print("PARALLEL VIDEO BATCH PROCESSOR")
     print("=" * 70)
     print(f"Videos found: {len(videos)}")
-    print(f"Video workers: {max_video_workers} (parallel videos)")
-    print(f"Chunk workers: 4 per video")
+    if use_processes:
+        print(f"Video workers: {max_video_workers} (parallel processes)")
+        print(f"Chunk workers: 4 per video")
+    else:
+        print(f"Video workers: {max_video_workers} (parallel videos)")
+        print(f"Chunk workers: {max_video_workers * 4} (shared by all videos)")
     print(f"Chunk size: {chunk_duration}s")
     print(f"Model: {model}")
     print(f"Output: {output_dir}")
     print("=" * 70)
 
-    # Process videos in parallel
-    all_results = []
-
-    with ThreadPoolExecutor(max_workers=max_video_workers) as executor:
-        future_to_video = {
-            executor.submit(
-                process_single_video_standalone,
-                video_path,
-                output_dir,
-                model,
-                chunk_duration,
-                i,
-                len(videos)
-            ): video_path
-            for i, video_path in enumerate(videos, 1)
-        }
-
-        for future in as_completed(future_to_video):
-            video_path = future_to_video[future]
-            try:
-                result = future.result()
-                all_results.append(result)
-            except Exception as e:
-                print(f"Video failed: {video_path} - {e}")
-                all_results.append({
-                    'video': video_path,
-                    'success': False,
-                    'error': str(e),
-                    'clips_count': 0,
-                    'clip_data': [],
-                })
-
-    # Now aggregate all results into master ontology
-    print("\n" + "=" * 70)
-    print("AGGREGATING RESULTS")
-    print("=" * 70)
-
-    # Load or create ontology
-    if os.path.exists(ontology_path):
-        master_ontology = MasterClipOntology.load_binary(ontology_path)
-    else:
-        master_ontology = MasterClipOntology()
+    # Probe every video concurrently instead of one ffprobe per worker on its critical path
+    durations = probe_durations(videos)
 
-    successful_videos = 0
-    total_clips = 0
+    # Process videos in parallel; in-process videos feed one chunk pool so idle
+    # workers pick up chunks from whichever video still has work queued
+    all_results = []
 
-    for result in all_results:
-        if result.get('success'):
-            successful_videos += 1
-            total_clips += result.get('clips_count', 0)
+    # try/finally so an interrupted batch doesn't leave its pools or chunk tree behind
+    executor = None
+    chunk_pool = None
+    chunk_dirs = None
+    chunk_root = None
+    try:
+        if use_processes:
+            # Thread pools and queues can't be shared with worker processes,
+            # so chunk_pool/chunk_dirs stay None
+            executor = ProcessPoolExecutor(
+                max_workers=max_video_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_video_workers)
+            chunk_pool = ThreadPoolExecutor(max_workers=max_video_workers * 4)
+            # One chunk directory per concurrent video, reused for the whole batch;
+            # on tmpfs only if every slot can hold the largest video's chunks at once
+            largest = max(os.path.getsize(v) for v in videos)
+            chunk_root = tempfile.mkdtemp(
+                prefix="ontology_chunks_", dir=chunk_temp_root(largest * max_video_workers)
+            )
+            chunk_dirs = queue.Queue()
+            for slot in range(max_video_workers):
+                slot_dir = os.path.join(chunk_root, f"worker_{slot}")
+                os.makedirs(slot_dir)
+                chunk_dirs.put(slot_dir)
 
-            # Update ontology from clips
-            for clip in result.get('clips', []):
-                master_ontology.update_from_clip(clip.ontology)
+        # Load or create ontology; results are aggregated into it as videos finish
+        if os.path.exists(ontology_path):
+            master_ontology = MasterClipOntology.load_binary(ontology_path)
+        else:
+            master_ontology = MasterClipOntology()
+
+        successful_videos = 0
+        total_clips = 0
+
+        with executor:
+            future_to_video = {
+                executor.submit(
+                    process_single_video_standalone,
+                    video_path,
+                    output_dir,
+                    model,
+                    chunk_duration,
+                    i,
+                    len(videos),
+                    chunk_pool,
+                    chunk_dirs,
+                    durations[video_path]
+                ): video_path
+                for i, video_path in enumerate(videos, 1)
+            }
 
-            master_ontology.videos_analyzed += 1
+            # Fold each video into the master ontology as it completes, then drop
+            # its clips so only in-flight videos' clips are held in memory
+            for future in as_completed(future_to_video):
+                video_path = future_to_video[future]
+                try:
+                    result = future.result()
+                    if result.get('success'):
+                        successful_videos += 1
+                        total_clips += result.get('clips_count', 0)
+                        for clip in result.pop('clips', []):
+                            master_ontology.update_from_clip(clip.ontology)
+                        master_ontology.videos_analyzed += 1
+                    all_results.append(result)
+                except Exception as e:
+                    log.error(f"Video failed: {video_path} - {e}")
+                    all_results.append({
+                        'video': video_path,
+                        'success': False,
+                        'error': str(e),
+                        'clips_count': 0,
+                        'clip_data': [],
+                    })
+
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if chunk_pool is not None:
+            chunk_pool.shutdown()
+        if chunk_root is not None:
+            shutil.rmtree(chunk_root, ignore_errors=True)
 
     # Save ontology
     ontology_text_path = ontology_path.replace('.pkl', '.txt')
     master_ontology.save(ontology_text_path)
     master_ontology.save_binary(ontology_path)
 
-    # Final summary
+    # Final summary - after any worker progress still queued
+    _drain_log()
     print("\n" + "=" * 70)
     print("BATCH COMPLETE")
     print("=" * 70)
@@ -759,6 +981,8 @@ def main():
                         help='Path to ontology file')
     parser.add_argument('--no-brain', action='store_true',
                         help='Skip brain synthesis step')
+    parser.add_argument('--processes', action='store_true',
+                        help='Run each parallel video in its own process')
 
     args = parser.parse_args()
 
@@ -766,6 +990,15 @@ def main():
         print("ERROR: GOOGLE_API_KEY not configured")
         sys.exit(1)
 
+    _start_log_listener()
+    try:
+        _run(args)
+    finally:
+        _stop_log_listener()
+
+
+def _run(args):
+    """Dispatch the parsed CLI arguments to the batch or single-video processor."""
     # Check if path is a directory or file
     if os.path.isdir(args.video_path):
         # Parallel batch processing
@@ -776,7 +1009,8 @@ def main():
             ontology_path=args.ontology,
             max_video_workers=args.video_workers,
             chunk_duration=args.chunk_size,
-            synthesize_brain=not args.no_brain
+            synthesize_brain=not args.no_brain,
+            use_processes=args.processes
         )
     else:
         # Single video - use existing processor
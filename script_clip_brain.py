@@ -14,11 +14,130 @@ building a library of "when the script says X, show Y" patterns.
 
 import os
 import pickle
+import pickletools
+import sys
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Any
 from datetime import datetime
 
 
+# Examples kept per clip type / function bucket
+MAX_EXAMPLES_PER_BUCKET = 50
+
+# Short categorical fields of stored examples; interned so repeated values share one object
+_CATEGORICAL_FIELDS = ('clip_type', 'function', 'setting_type', 'subject_type', 'shot_type', 'subject_action')
+
+
+def _intern(value):
+    """sys.intern for strings, anything else (e.g. None from JSON nulls) unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _truncate(text: str, limit: int) -> str:
+    """First limit characters of text, with "..." appended if anything was cut."""
+    head = text[:limit]
+    return head + "..." if text[limit:limit + 1] else head
+
+
+@lru_cache(maxsize=4096)
+def _classify_clip(
+    subject: str,
+    setting: str,
+    product_in_desc: bool,
+    testimonial_in_desc: bool,
+    subject_action: str
+) -> str:
+    """
+    Clip type for the fields _determine_clip_type extracts.
+
+    subject, setting and subject_action are the raw categorical values; they repeat
+    across clips, so lowercasing them here only happens on cache misses.
+    """
+    subject = subject.lower()
+    subject_action = subject_action.lower()
+    if subject == 'product' or product_in_desc:
+        return 'product_shot'
+    elif subject in ['text_screen', 'graphic']:
+        return 'text_graphic'
+    elif 'screen_recording' in setting.lower():
+        return 'screen_demo'
+    elif subject == 'person':
+        if subject_action == 'speaking':
+            return 'talking_head'
+        elif subject_action == 'demonstrating':
+            return 'demonstration'
+        elif testimonial_in_desc:
+            return 'testimonial'
+        else:
+            return 'lifestyle'
+    elif subject == 'b_roll':
+        return 'broll'
+    else:
+        return 'other'
+
+
+_SEP_EQ80 = "=" * 80
+_SEP_DASH80 = "-" * 80
+
+# Playbook definitions for each clip type (PART 1), in render order
+_CLIP_TYPE_DESCRIPTIONS = {
+    'talking_head': 'Person speaking directly to camera. Use for direct address, personal connection, credibility.',
+    'product_shot': 'Close-up or beauty shot of the product. Use when mentioning the product, features, or results.',
+    'screen_demo': 'Screen recording or software demonstration. Use when showing how something works.',
+    'broll': 'Supplementary footage. Use to illustrate concepts, add visual interest, or cover cuts.',
+    'text_graphic': 'Text, titles, or graphics on screen. Use for emphasis, stats, quotes, or CTAs.',
+    'lifestyle': 'People using product or in relevant situations. Use for aspirational or relatable moments.',
+    'demonstration': 'Person actively showing/doing something. Use for tutorials, how-tos, proof.',
+    'testimonial': 'Customer or user speaking. Use for social proof and credibility.',
+}
+
+# Playbook definitions for each ad-structure function (PART 2), in render order
+_FUNCTION_DESCRIPTIONS = {
+    'hook': 'Opening that grabs attention. First 3-5 seconds.',
+    'problem': 'Identifying the pain point or challenge.',
+    'agitation': 'Making the problem feel urgent or painful.',
+    'solution': 'Introducing the product/service as the answer.',
+    'demo': 'Showing how it works.',
+    'benefit': 'Explaining what the viewer gains.',
+    'proof': 'Evidence it works (testimonials, stats, results).',
+    'cta': 'Call to action - what to do next.',
+    'transition': 'Connecting segments, pacing changes.',
+}
+
+# Static closing section of the playbook text (PART 4), built once
+_QUICK_REFERENCE_RULES = "\n".join([
+    "",
+    _SEP_EQ80,
+    "PART 4: QUICK REFERENCE RULES",
+    _SEP_EQ80,
+    "",
+    "CONCEPTUAL BOUNDARIES:",
+    "  - Break script at natural thought boundaries",
+    "  - If a line takes >3 seconds to say, it likely needs multiple clips",
+    "  - Each clip should have ONE visual focus",
+    "  - Change clip when: topic shifts, emotion shifts, or emphasis needed",
+    "",
+    "MATCHING RULES:",
+    "  - Mention product by name -> PRODUCT SHOT",
+    "  - Show how it works -> SCREEN DEMO or DEMONSTRATION",
+    "  - Direct address ('you', 'your') -> TALKING HEAD",
+    "  - Stats or key points -> TEXT GRAPHIC",
+    "  - Emotional/aspirational language -> LIFESTYLE or BROLL",
+    "  - Customer quote or result -> TESTIMONIAL",
+    "  - Action words (click, sign up, get) -> CTA with TEXT GRAPHIC",
+    "",
+    "PACING:",
+    "  - Don't stay on talking head too long - cut to broll/product",
+    "  - After product shot, often return to talking head",
+    "  - Text graphics are punchy - use for emphasis, not narration",
+    "  - Broll covers transitions and adds visual variety",
+    "",
+    _SEP_EQ80,
+])
+
+
 @dataclass
 class ClipExample:
     """A single example of script-to-clip mapping."""
@@ -31,7 +150,7 @@ class ClipExample:
     function: str  # hook, problem, agitation, solution, demo, benefit, proof, cta, transition
 
 
-@dataclass
+@dataclass(repr=False, eq=False)
 class ScriptClipBrain:
     """
     The master playbook for script-to-clip selection.
@@ -48,15 +167,15 @@ class ScriptClipBrain:
 
     # THE PLAYBOOK: Organized by clip type
     # clip_type -> list of examples
-    playbook: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    playbook: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
 
     # Examples organized by function (hook, problem, solution, etc.)
     # function -> list of examples
-    by_function: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    by_function: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
 
     # Transition patterns: what clip types follow what
     # "clip_type -> clip_type" -> list of script context examples
-    transitions: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    transitions: Dict[str, List[Dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
 
     def __post_init__(self):
         if not self.created_at:
@@ -76,191 +195,243 @@ class ScriptClipBrain:
             'other'
         ]
         for ct in clip_types:
-            if ct not in self.playbook:
-                self.playbook[ct] = []
+            self.playbook.setdefault(ct, [])
+
+        self._rebuild_indexes()
+
+    def __repr__(self):
+        return f"<ScriptClipBrain v{self.version} videos={self.videos_learned_from}>"
+
+    def __reduce__(self):
+        # Only the source fields, as plain dicts - the indexes are rebuilt on load and
+        # the pickle doesn't depend on the defaultdict factory
+        return (_rebuild_brain, (
+            self.version, self.created_at, self.updated_at, self.videos_learned_from,
+            dict(self.playbook), dict(self.by_function), dict(self.transitions),
+        ))
+
+    def __setstate__(self, state):
+        # Also handles brains pickled with the default instance state
+        self.__dict__.update(state)
+        for name in ('playbook', 'by_function', 'transitions'):
+            setattr(self, name, defaultdict(list, getattr(self, name)))
+        # Unpickling doesn't intern strings - restore sharing for the categorical fields
+        for buckets in (self.playbook, self.by_function):
+            for examples in buckets.values():
+                for ex in examples:
+                    for name in _CATEGORICAL_FIELDS:
+                        if name in ex:
+                            ex[name] = _intern(ex[name])
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self):
+        """Rebuild the lookup indexes derived from playbook and by_function."""
+        index = {}
+        for prefix, buckets in (('playbook', self.playbook), ('func', self.by_function)):
+            for name, examples in buckets.items():
+                index[f"{prefix}:{name}"] = {
+                    ex.get('script', '').lower() for ex in examples if ex.get('script')
+                }
+        # "playbook:<clip_type>" / "func:<function>" -> set of lowercased scripts
+        self._script_index: Dict[str, set] = index
+
+        # clip_type -> function -> that clip type's playbook examples, in playbook order
+        self._by_type_func: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        for clip_type, examples in self.playbook.items():
+            grouped = self._by_type_func[clip_type] = {}
+            for ex in examples:
+                grouped.setdefault(ex.get('function', 'unknown'), []).append(ex)
+
+    def learn_video(self, clips: List[Dict[str, Any]]):
+        """Learn from all clips of one analyzed video, updating the timestamp once."""
+        for clip_data in clips:
+            self.learn_from_clip(clip_data, _touch=False)
+        self.updated_at = datetime.now().isoformat()
 
-    def learn_from_clip(self, clip_data: Dict[str, Any]):
+    def learn_from_clip(self, clip_data: Dict[str, Any], _touch: bool = True):
         """Learn from a single analyzed clip."""
         visual = clip_data.get('visual', {})
         functional = clip_data.get('functional', {})
 
-        script = clip_data.get('script_segment', '').strip()
-        clip_type = self._determine_clip_type(visual, functional)
-        function = functional.get('clip_function', 'unknown')
+        clip_type = _intern(self._determine_clip_type(visual, functional))
+        function = _intern(functional.get('clip_function', 'unknown'))
+        if _touch:
+            self.updated_at = datetime.now().isoformat()
+
+        # Both buckets full (the steady state on large corpora) - nothing to add
+        if (len(self.playbook.get(clip_type, ())) >= MAX_EXAMPLES_PER_BUCKET
+                and len(self.by_function.get(function, ())) >= MAX_EXAMPLES_PER_BUCKET):
+            return
 
+        script = clip_data.get('script_segment', '').strip()
         example = {
             'script': script,
             'clip_type': clip_type,
             'visual_description': visual.get('subject_description', ''),
             'setting': visual.get('setting_description', ''),
-            'setting_type': visual.get('setting_type', ''),
-            'subject_type': visual.get('subject_type', ''),
-            'subject_action': visual.get('subject_action', ''),
+            'setting_type': _intern(visual.get('setting_type', '')),
+            'subject_type': _intern(visual.get('subject_type', '')),
+            'subject_action': _intern(visual.get('subject_action', '')),
             'text_on_screen': visual.get('text_on_screen', []),
-            'shot_type': visual.get('shot_type', ''),
+            'shot_type': _intern(visual.get('shot_type', '')),
             'function': function,
         }
 
-        # Add to playbook by clip type
-        if clip_type not in self.playbook:
-            self.playbook[clip_type] = []
+        script_key = script.lower()
 
-        # Avoid duplicates, keep diverse examples (max 50 per type)
-        if len(self.playbook[clip_type]) < 50:
-            if not self._is_duplicate(example, self.playbook[clip_type]):
-                self.playbook[clip_type].append(example)
+        # Add to playbook by clip type (and its per-function grouping used by to_text)
+        if self._add_example(self.playbook, f"playbook:{clip_type}", clip_type, example, script_key):
+            self._by_type_func.setdefault(clip_type, {}).setdefault(function, []).append(example)
 
         # Add to by_function
-        if function not in self.by_function:
-            self.by_function[function] = []
-        if len(self.by_function[function]) < 50:
-            if not self._is_duplicate(example, self.by_function[function]):
-                self.by_function[function].append(example)
-
-        self.updated_at = datetime.now().isoformat()
+        self._add_example(self.by_function, f"func:{function}", function, example, script_key)
+
+    def _add_example(
+        self,
+        buckets: Dict[str, List[Dict[str, Any]]],
+        index_key: str,
+        name: str,
+        example: Dict[str, Any],
+        script_key: str
+    ) -> bool:
+        """Append example to buckets[name] unless its script is already there. Returns True if added."""
+        examples = buckets[name]
+
+        # Avoid duplicates, keep diverse examples (capped per bucket)
+        if len(examples) < MAX_EXAMPLES_PER_BUCKET:
+            if not self._is_duplicate(index_key, script_key):
+                examples.append(example)
+                if script_key:
+                    self._script_index.setdefault(index_key, set()).add(script_key)
+                return True
+        return False
 
     def learn_transition(self, clip1_data: Dict, clip2_data: Dict):
         """Learn what clip types follow each other and in what context."""
-        visual1 = clip1_data.get('visual', {})
-        visual2 = clip2_data.get('visual', {})
-        functional1 = clip1_data.get('functional', {})
-        functional2 = clip2_data.get('functional', {})
+        type1 = self._determine_clip_type(clip1_data.get('visual', {}), clip1_data.get('functional', {}))
+        type2 = self._determine_clip_type(clip2_data.get('visual', {}), clip2_data.get('functional', {}))
 
-        type1 = self._determine_clip_type(visual1, functional1)
-        type2 = self._determine_clip_type(visual2, functional2)
+        self._record_transition(clip1_data, clip2_data, type1, type2)
 
-        transition_key = f"{type1} -> {type2}"
+    def _record_transition(self, clip1_data: Dict, clip2_data: Dict, type1: str, type2: str):
+        """Store the transition between two clips whose types are already known."""
+        transition_key = sys.intern(f"{type1} -> {type2}")
 
-        if transition_key not in self.transitions:
-            self.transitions[transition_key] = []
-
-        if len(self.transitions[transition_key]) < 20:
-            self.transitions[transition_key].append({
+        examples = self.transitions[transition_key]
+        if len(examples) < 20:
+            examples.append({
                 'from_script': clip1_data.get('script_segment', ''),
-                'from_function': functional1.get('clip_function', ''),
+                'from_function': clip1_data.get('functional', {}).get('clip_function', ''),
                 'to_script': clip2_data.get('script_segment', ''),
-                'to_function': functional2.get('clip_function', ''),
+                'to_function': clip2_data.get('functional', {}).get('clip_function', ''),
             })
 
     def learn_sequence(self, clips: List[Dict[str, Any]]):
         """Learn transitions from a sequence of clips."""
+        # Classify each clip once; every inner clip takes part in two transitions
+        types = [
+            self._determine_clip_type(c.get('visual', {}), c.get('functional', {}))
+            for c in clips
+        ]
         for i in range(len(clips) - 1):
-            self.learn_transition(clips[i], clips[i + 1])
+            self._record_transition(clips[i], clips[i + 1], types[i], types[i + 1])
 
     def _determine_clip_type(self, visual: Dict, functional: Dict) -> str:
         """Categorize the clip type."""
-        subject = visual.get('subject_type', '').lower()
-        setting = visual.get('setting_type', '').lower()
+        # Free text, unlike the categorical fields - lowered here rather than in the cache key
         subject_desc = visual.get('subject_description', '').lower()
-        subject_action = visual.get('subject_action', '').lower()
-
-        if subject == 'product' or 'product' in subject_desc:
-            return 'product_shot'
-        elif subject in ['text_screen', 'graphic']:
-            return 'text_graphic'
-        elif 'screen_recording' in setting or setting == 'screen_recording':
-            return 'screen_demo'
-        elif subject == 'person':
-            if subject_action == 'speaking':
-                return 'talking_head'
-            elif subject_action == 'demonstrating':
-                return 'demonstration'
-            elif 'testimonial' in subject_desc or 'customer' in subject_desc:
-                return 'testimonial'
-            else:
-                return 'lifestyle'
-        elif subject == 'b_roll':
-            return 'broll'
-        else:
-            return 'other'
-
-    def _is_duplicate(self, example: Dict, examples: List[Dict]) -> bool:
-        """Check if example is too similar to existing ones."""
-        script = example.get('script', '').lower()
-        if not script:
-            return False
-        for ex in examples:
-            if ex.get('script', '').lower() == script:
-                return True
-        return False
 
-    def save(self, path: str):
-        """Save brain to pickle."""
+        return _classify_clip(
+            visual.get('subject_type', ''),
+            visual.get('setting_type', ''),
+            'product' in subject_desc,
+            'testimonial' in subject_desc or 'customer' in subject_desc,
+            visual.get('subject_action', '')
+        )
+
+    def _is_duplicate(self, index_key: str, script_key: str) -> bool:
+        """
+        Check if a (lowercased) script is already in the bucket behind index_key.
+
+        A single set lookup against _script_index; no per-example scan or compare.
+        """
+        return bool(script_key) and script_key in self._script_index.get(index_key, ())
+
+    def save(self, path: str, buffer_callback=None):
+        """
+        Save brain to pickle.
+
+        buffer_callback is passed through to pickle.dumps (PEP 574). Callers storing
+        large buffers (e.g. embedding arrays) can use it to keep them out-of-band and
+        hand the collected buffers back to load().
+        """
+        data = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL, buffer_callback=buffer_callback)
+        if buffer_callback is None:
+            # Strip unused memo PUTs from the stream
+            data = pickletools.optimize(data)
         with open(path, 'wb') as f:
-            pickle.dump(self, f)
+            f.write(data)
 
     @classmethod
-    def load(cls, path: str) -> 'ScriptClipBrain':
-        """Load brain from pickle."""
+    def load(cls, path: str, buffers=None) -> 'ScriptClipBrain':
+        """Load brain from pickle. Pass buffers when the brain was saved with a buffer_callback."""
         if os.path.exists(path):
             with open(path, 'rb') as f:
-                return pickle.load(f)
+                return pickle.load(f, buffers=buffers)
         return cls()
 
     def to_text(self) -> str:
         """Generate the complete playbook as text."""
         lines = []
 
-        lines.append("=" * 80)
-        lines.append("SCRIPT-TO-CLIP PLAYBOOK")
-        lines.append("=" * 80)
-        lines.append(f"Videos Analyzed: {self.videos_learned_from}")
-        lines.append(f"Last Updated: {self.updated_at}")
-        lines.append("")
-        lines.append("This playbook shows what clips to use for different script content.")
-        lines.append("Use it as a reference when breaking down a new script.")
-        lines.append("")
+        lines.extend([
+            _SEP_EQ80,
+            "SCRIPT-TO-CLIP PLAYBOOK",
+            _SEP_EQ80,
+            f"Videos Analyzed: {self.videos_learned_from}",
+            f"Last Updated: {self.updated_at}",
+            "",
+            "This playbook shows what clips to use for different script content.",
+            "Use it as a reference when breaking down a new script.",
+            "",
+        ])
 
         # ===========================================
         # SECTION 1: CLIP TYPES AND WHEN TO USE THEM
         # ===========================================
-        lines.append("=" * 80)
-        lines.append("PART 1: CLIP TYPES - WHEN TO USE EACH")
-        lines.append("=" * 80)
-        lines.append("")
-
-        clip_type_descriptions = {
-            'talking_head': 'Person speaking directly to camera. Use for direct address, personal connection, credibility.',
-            'product_shot': 'Close-up or beauty shot of the product. Use when mentioning the product, features, or results.',
-            'screen_demo': 'Screen recording or software demonstration. Use when showing how something works.',
-            'broll': 'Supplementary footage. Use to illustrate concepts, add visual interest, or cover cuts.',
-            'text_graphic': 'Text, titles, or graphics on screen. Use for emphasis, stats, quotes, or CTAs.',
-            'lifestyle': 'People using product or in relevant situations. Use for aspirational or relatable moments.',
-            'demonstration': 'Person actively showing/doing something. Use for tutorials, how-tos, proof.',
-            'testimonial': 'Customer or user speaking. Use for social proof and credibility.',
-        }
-
-        for clip_type, description in clip_type_descriptions.items():
+        lines.extend([
+            _SEP_EQ80,
+            "PART 1: CLIP TYPES - WHEN TO USE EACH",
+            _SEP_EQ80,
+            "",
+        ])
+
+        for clip_type, description in _CLIP_TYPE_DESCRIPTIONS.items():
             examples = self.playbook.get(clip_type, [])
 
-            lines.append("-" * 80)
-            lines.append(f"## {clip_type.upper().replace('_', ' ')}")
-            lines.append("-" * 80)
-            lines.append(f"Definition: {description}")
-            lines.append(f"Examples in library: {len(examples)}")
-            lines.append("")
+            lines.extend([
+                _SEP_DASH80,
+                f"## {clip_type.upper().replace('_', ' ')}",
+                _SEP_DASH80,
+                f"Definition: {description}",
+                f"Examples in library: {len(examples)}",
+                "",
+            ])
 
             if examples:
                 lines.append("WHEN TO USE (learned from real ads):")
                 lines.append("")
 
-                # Group by function
-                by_func = {}
-                for ex in examples:
-                    func = ex.get('function', 'unknown')
-                    if func not in by_func:
-                        by_func[func] = []
-                    by_func[func].append(ex)
+                # Already grouped by function at learn time
+                by_func = self._by_type_func.get(clip_type, {})
 
                 for func, func_examples in sorted(by_func.items()):
                     lines.append(f"  For {func.upper()} segments:")
                     for ex in func_examples[:3]:  # Show up to 3 per function
-                        script = ex.get('script', '[no dialogue]')
-                        if len(script) > 80:
-                            script = script[:80] + "..."
+                        script = _truncate(ex.get('script', '[no dialogue]'), 80)
                         lines.append(f"    Script: \"{script}\"")
                         if ex.get('visual_description'):
-                            lines.append(f"    Visual: {ex['visual_description'][:60]}")
+                            lines.append(f"    Visual: {ex['visual_description']:.60}")
                         if ex.get('text_on_screen'):
                             lines.append(f"    Text on screen: {ex['text_on_screen']}")
                         lines.append("")
@@ -271,56 +442,43 @@ class ScriptClipBrain:
         # ===========================================
         # SECTION 2: BY SCRIPT FUNCTION
         # ===========================================
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("PART 2: CLIP SELECTION BY SCRIPT FUNCTION")
-        lines.append("=" * 80)
-        lines.append("")
-        lines.append("What clips work best for each part of the ad structure:")
-        lines.append("")
-
-        function_descriptions = {
-            'hook': 'Opening that grabs attention. First 3-5 seconds.',
-            'problem': 'Identifying the pain point or challenge.',
-            'agitation': 'Making the problem feel urgent or painful.',
-            'solution': 'Introducing the product/service as the answer.',
-            'demo': 'Showing how it works.',
-            'benefit': 'Explaining what the viewer gains.',
-            'proof': 'Evidence it works (testimonials, stats, results).',
-            'cta': 'Call to action - what to do next.',
-            'transition': 'Connecting segments, pacing changes.',
-        }
-
-        for function, description in function_descriptions.items():
+        lines.extend([
+            "",
+            _SEP_EQ80,
+            "PART 2: CLIP SELECTION BY SCRIPT FUNCTION",
+            _SEP_EQ80,
+            "",
+            "What clips work best for each part of the ad structure:",
+            "",
+        ])
+
+        for function, description in _FUNCTION_DESCRIPTIONS.items():
             examples = self.by_function.get(function, [])
 
-            lines.append("-" * 80)
-            lines.append(f"## {function.upper()}")
-            lines.append("-" * 80)
-            lines.append(f"Purpose: {description}")
-            lines.append("")
+            lines.extend([
+                _SEP_DASH80,
+                f"## {function.upper()}",
+                _SEP_DASH80,
+                f"Purpose: {description}",
+                "",
+            ])
 
             if examples:
                 # Count clip types used
-                type_counts = {}
-                for ex in examples:
-                    ct = ex.get('clip_type', 'unknown')
-                    type_counts[ct] = type_counts.get(ct, 0) + 1
+                type_counts = Counter(ex.get('clip_type', 'unknown') for ex in examples)
 
                 lines.append("Clip types that work for this:")
-                for ct, count in sorted(type_counts.items(), key=lambda x: -x[1]):
+                for ct, count in type_counts.most_common():
                     lines.append(f"  - {ct}")
                 lines.append("")
 
                 lines.append("Examples:")
                 for ex in examples[:5]:
-                    script = ex.get('script', '[no dialogue]')
-                    if len(script) > 70:
-                        script = script[:70] + "..."
+                    script = _truncate(ex.get('script', '[no dialogue]'), 70)
                     lines.append(f"  Script: \"{script}\"")
                     lines.append(f"  -> Use: {ex.get('clip_type', '?')}")
                     if ex.get('visual_description'):
-                        lines.append(f"     Show: {ex['visual_description'][:50]}")
+                        lines.append(f"     Show: {ex['visual_description']:.50}")
                     lines.append("")
             else:
                 lines.append("  No examples yet.")
@@ -330,58 +488,50 @@ class ScriptClipBrain:
         # SECTION 3: TRANSITIONS
         # ===========================================
         if self.transitions:
-            lines.append("")
-            lines.append("=" * 80)
-            lines.append("PART 3: CLIP TRANSITIONS")
-            lines.append("=" * 80)
-            lines.append("")
-            lines.append("What clip types naturally follow each other:")
-            lines.append("")
+            lines.extend([
+                "",
+                _SEP_EQ80,
+                "PART 3: CLIP TRANSITIONS",
+                _SEP_EQ80,
+                "",
+                "What clip types naturally follow each other:",
+                "",
+            ])
 
             for transition, examples in sorted(self.transitions.items()):
                 lines.append(f"  {transition}")
                 if examples:
                     ex = examples[0]
-                    from_script = ex.get('from_script', '')[:40]
-                    to_script = ex.get('to_script', '')[:40]
+                    from_script = ex.get('from_script', '')
+                    to_script = ex.get('to_script', '')
                     if from_script or to_script:
-                        lines.append(f"    e.g., \"{from_script}...\" -> \"{to_script}...\"")
+                        lines.append(f"    e.g., \"{from_script:.40}...\" -> \"{to_script:.40}...\"")
                 lines.append("")
 
         # ===========================================
         # SECTION 4: QUICK REFERENCE RULES
         # ===========================================
-        lines.append("")
-        lines.append("=" * 80)
-        lines.append("PART 4: QUICK REFERENCE RULES")
-        lines.append("=" * 80)
-        lines.append("")
-        lines.append("CONCEPTUAL BOUNDARIES:")
-        lines.append("  - Break script at natural thought boundaries")
-        lines.append("  - If a line takes >3 seconds to say, it likely needs multiple clips")
-        lines.append("  - Each clip should have ONE visual focus")
-        lines.append("  - Change clip when: topic shifts, emotion shifts, or emphasis needed")
-        lines.append("")
-        lines.append("MATCHING RULES:")
-        lines.append("  - Mention product by name -> PRODUCT SHOT")
-        lines.append("  - Show how it works -> SCREEN DEMO or DEMONSTRATION")
-        lines.append("  - Direct address ('you', 'your') -> TALKING HEAD")
-        lines.append("  - Stats or key points -> TEXT GRAPHIC")
-        lines.append("  - Emotional/aspirational language -> LIFESTYLE or BROLL")
-        lines.append("  - Customer quote or result -> TESTIMONIAL")
-        lines.append("  - Action words (click, sign up, get) -> CTA with TEXT GRAPHIC")
-        lines.append("")
-        lines.append("PACING:")
-        lines.append("  - Don't stay on talking head too long - cut to broll/product")
-        lines.append("  - After product shot, often return to talking head")
-        lines.append("  - Text graphics are punchy - use for emphasis, not narration")
-        lines.append("  - Broll covers transitions and adds visual variety")
-        lines.append("")
-        lines.append("=" * 80)
+        lines.append(_QUICK_REFERENCE_RULES)
 
         return "\n".join(lines)
 
 
+def _rebuild_brain(version, created_at, updated_at, videos_learned_from,
+                   playbook, by_function, transitions) -> ScriptClipBrain:
+    """Unpickle target for ScriptClipBrain.__reduce__."""
+    brain = ScriptClipBrain.__new__(ScriptClipBrain)
+    brain.__setstate__({
+        'version': version,
+        'created_at': created_at,
+        'updated_at': updated_at,
+        'videos_learned_from': videos_learned_from,
+        'playbook': playbook,
+        'by_function': by_function,
+        'transitions': transitions,
+    })
+    return brain
+
+
 def main():
     """CLI to view brain/playbook."""
     import argparse
@@ -194,6 +194,7 @@ async function analyzeVideo() {
         const decoder = new TextDecoder();
         let progress = 10;
         let buffer = ''; // Buffer for incomplete messages
+        let outputChunks = []; // Result text arrives in pieces before the success message
 
         while (true) {
             const { done, value } = await reader.read();
@@ -221,6 +222,10 @@ async function analyzeVideo() {
                                 throw new Error(data.error);
                             }
 
+                            if (data.chunk) {
+                                outputChunks.push(data.chunk);
+                            }
+
                             if (data.status) {
                                 // Update progress bar with real message
                                 progress = Math.min(progress + 2, 95);
@@ -229,7 +234,7 @@ async function analyzeVideo() {
 
                             if (data.success) {
                                 updateProgress(100, 'Complete!');
-                                analysisResult = { output: data.output };
+                                analysisResult = { output: data.output ?? outputChunks.join('') };
                                 displayResults(analysisResult);
                             }
                         } catch (e) {
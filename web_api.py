@@ -5,23 +5,97 @@ Simplified API for web-based video analysis deployment
 """
 
 import os
+import shutil
+import struct
 import sys
 import tempfile
+import time
 from datetime import datetime
-from io import StringIO
-from contextlib import redirect_stdout
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+import aiofiles
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from config import Config
 from iterative_analyzer import IterativeClipAnalyzer
-import glob
 import asyncio
+import hashlib
 import json
+import orjson
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Bytes copied from an upload per read
+UPLOAD_CHUNK = 8 * 1024 * 1024
+
+# Long-running analyses get their own threads, so they can't starve the default
+# executor that upload copies, compression and aiofiles reads run on
+ANALYSIS_POOL = ThreadPoolExecutor(
+    max_workers=Config.GEMINI_MAX_CONCURRENT_REQUESTS,
+    thread_name_prefix='analyze'
+)
+
+# Leading bytes of the container formats we accept - the client's content_type can't be trusted
+# (189 bytes covers a second MPEG-TS sync byte at offset 188)
+VIDEO_SNIFF_BYTES = 189
+TS_PACKET_SIZE = 188
+MP4_BOX_TYPES = frozenset({b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip'})  # MP4 / MOV
+VIDEO_MAGIC_PREFIXES = (
+    b'\x1a\x45\xdf\xa3',                  # Matroska / WebM
+    b'FLV',                                # Flash video
+    b'\x00\x00\x01\xba', b'\x00\x00\x01\xb3',  # MPEG program stream
+    b'\x30\x26\xb2\x75\x8e\x66\xcf\x11',  # ASF / WMV
+    b'OggS',                               # Ogg / OGV
+)
+
+# Analysis outputs remembered per upload hash, so re-uploading a video skips Gemini
+RESULT_CACHE_SIZE = 256
+_result_cache: "OrderedDict[str, str]" = OrderedDict()
 
 # Create FastAPI app
-app = FastAPI(title="Video Analyzer API", version="1.0.0")
+app = FastAPI(title="Video Analyzer API", version="1.0.0", default_response_class=ORJSONResponse)
+
+
+class UploadSizeLimit:
+    """
+    ASGI middleware rejecting uploads whose Content-Length is over the endpoint's limit.
+
+    FastAPI parses the whole multipart body before an endpoint runs, so this is the
+    only place an oversized upload can be refused before it is received. limits maps
+    a path to its maximum file size in bytes; the endpoints still count bytes too, for
+    clients that send no (or a wrong) Content-Length.
+    """
+
+    # Slack for the multipart boundaries and part headers around the file
+    FORM_OVERHEAD = 64 * 1024
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            limit = self.limits.get(scope['path'])
+            if limit is not None:
+                length = dict(scope['headers']).get(b'content-length', b'')
+                if length.isdigit() and int(length) > limit + self.FORM_OVERHEAD:
+                    response = ORJSONResponse(
+                        {"detail": f"Video file too large. Maximum size is {limit // (1024 * 1024)}MB."},
+                        status_code=413
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so its 413 responses still get CORS headers
+app.add_middleware(UploadSizeLimit, limits={
+    "/api/analyze-video-stream": 200 * 1024 * 1024,
+    "/api/analyze-video": 20 * 1024 * 1024,
+})
 
 # CORS - allow all origins for web access
 app.add_middleware(
@@ -40,6 +114,189 @@ os.makedirs("outputs", exist_ok=True)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+# Runs compression encodes at lower CPU and I/O priority than the API process, where
+# the tools exist (coreutils nice, util-linux ionice)
+ENCODE_PRIORITY_PREFIX = (
+    (['nice', '-n', '10'] if shutil.which('nice') else [])
+    + (['ionice', '-c', '2', '-n', '7'] if shutil.which('ionice') else [])
+)
+
+# libx264 threads per encode - half the cores, so two concurrent uploads share the CPU
+# instead of each spawning a thread per core
+ENCODE_THREADS = max(2, (os.cpu_count() or 4) // 2)
+
+# Hardware H.264 encoders, in order of preference; libx264 is always the last resort
+HW_H264_ENCODERS = ('h264_nvenc', 'h264_videotoolbox', 'h264_qsv')
+
+
+@lru_cache(maxsize=None)
+def h264_encoders() -> tuple:
+    """H.264 encoders to try, best first. Queries `ffmpeg -encoders` once per process."""
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=10, check=True
+        )
+        listed = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+    except (OSError, subprocess.SubprocessError):
+        listed = set()
+    return tuple(enc for enc in HW_H264_ENCODERS if enc in listed) + ('libx264',)
+
+
+def _video_codec_args(encoder: str, video_bitrate: int) -> list:
+    """ffmpeg video encoding options for encoder at an average of video_bitrate kbps."""
+    if encoder == 'h264_nvenc':
+        return ['-c:v', encoder, '-preset', 'p1', '-rc', 'vbr', '-b:v', f'{video_bitrate}k', '-pix_fmt', 'yuv420p']
+    if encoder == 'h264_videotoolbox':
+        return ['-c:v', encoder, '-b:v', f'{video_bitrate}k', '-allow_sw', '1', '-pix_fmt', 'yuv420p']
+    if encoder == 'h264_qsv':
+        return ['-c:v', encoder, '-preset', 'veryfast', '-b:v', f'{video_bitrate}k', '-pix_fmt', 'nv12']
+    return [
+        '-c:v', 'libx264',
+        '-threads', str(ENCODE_THREADS),
+        '-preset', 'faster',  # Bitrate sets the size; faster keeps the encode well inside the timeout
+        '-b:v', f'{video_bitrate}k',  # Plain ABR - the average is all the size target needs
+        '-tune', 'fastdecode',
+        '-profile:v', 'baseline', '-level', '3.1',
+        '-pix_fmt', 'yuv420p',
+    ]
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: int = None):
+    """Yield (type, payload_start, payload_end) for the ISO BMFF boxes in data[start:end]."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from('>Q', data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type, pos + header, pos + size
+        pos += size
+
+
+def _read_moov(input_path: str) -> Optional[bytes]:
+    """Payload of the top-level moov box, seeking past the media data to find it."""
+    with open(input_path, 'rb') as f:
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            size, box_type = struct.unpack('>I4s', header)
+            header_len = 8
+            if size == 1:
+                size = struct.unpack('>Q', f.read(8))[0]
+                header_len = 16
+            elif size == 0:
+                return f.read() if box_type == b'moov' else None
+            if size < header_len:
+                return None
+            if box_type == b'moov':
+                return f.read(size - header_len)
+            f.seek(size - header_len, os.SEEK_CUR)
+
+
+def _probe_mp4_header(input_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Duration, first video track size and audio presence from an MP4/MOV moov box.
+
+    Returns None when the file isn't a parseable MP4/MOV, so the caller can fall
+    back to ffprobe.
+    """
+    try:
+        moov = _read_moov(input_path)
+    except (OSError, struct.error):
+        return None
+    if not moov:
+        return None
+
+    duration = 0.0
+    video_size = None
+    has_audio = False
+    for box_type, start, end in _iter_boxes(moov):
+        if box_type == b'mvhd':
+            if moov[start] == 1:
+                timescale, length = struct.unpack_from('>IQ', moov, start + 20)
+            else:
+                timescale, length = struct.unpack_from('>II', moov, start + 12)
+            if timescale:
+                duration = length / timescale
+        elif box_type == b'trak':
+            track_size = None
+            handler = None
+            for child, c_start, c_end in _iter_boxes(moov, start, end):
+                if child == b'tkhd' and c_end - c_start >= 8:
+                    # Width and height are the last two 16.16 fixed-point fields
+                    w, h = struct.unpack_from('>II', moov, c_end - 8)
+                    track_size = (w >> 16, h >> 16)
+                elif child == b'mdia':
+                    for mdia_child, m_start, m_end in _iter_boxes(moov, c_start, c_end):
+                        if mdia_child == b'hdlr' and m_end - m_start >= 12:
+                            handler = moov[m_start + 8:m_start + 12]
+            if handler == b'vide' and video_size is None:
+                video_size = track_size
+            elif handler == b'soun':
+                has_audio = True
+
+    if duration <= 0 or not video_size:
+        return None
+    return {
+        'duration': duration,
+        'width': video_size[0],
+        'height': video_size[1],
+        'has_audio': has_audio,
+        'mp4_header': True,
+    }
+
+
+def probe_video(input_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Duration, video dimensions and audio presence, or None if there is no video stream.
+
+    MP4/MOV files are read straight from their moov box (mp4_header=True); anything
+    else goes to ffprobe.
+    """
+    info = _probe_mp4_header(input_path)
+    if info:
+        return info
+
+    probe_cmd = [
+        'ffprobe', '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format', '-show_streams',
+        input_path
+    ]
+    result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=10, check=True)
+    data = json.loads(result.stdout)
+
+    # Find video stream
+    video_stream = None
+    audio_stream = None
+    for stream in data.get('streams', []):
+        if stream.get('codec_type') == 'video' and not video_stream:
+            video_stream = stream
+        elif stream.get('codec_type') == 'audio' and not audio_stream:
+            audio_stream = stream
+
+    if not video_stream:
+        return None
+
+    return {
+        'duration': float(data.get('format', {}).get('duration', 0)),
+        'width': video_stream.get('width', 0),
+        'height': video_stream.get('height', 0),
+        'has_audio': audio_stream is not None,
+        'mp4_header': False,
+    }
+
+
 def compress_video(input_path: str, output_path: str, target_size_mb: float = 90) -> bool:
     """
     Smart video compression using proven algorithm from compress_videos.py
@@ -54,37 +311,16 @@ def compress_video(input_path: str, output_path: str, target_size_mb: float = 90
     """
     try:
         # Probe video for detailed information
-        probe_cmd = [
-            'ffprobe', '-v', 'quiet',
-            '-print_format', 'json',
-            '-show_format', '-show_streams',
-            input_path
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True, timeout=10, check=True)
-        data = json.loads(result.stdout)
-
-        # Extract format info
-        fmt = data.get('format', {})
-        duration = float(fmt.get('duration', 0))
-        file_size = int(fmt.get('size', 0))
-        current_size_mb = file_size / (1024 * 1024)
-
-        # Find video stream
-        video_stream = None
-        audio_stream = None
-        for stream in data.get('streams', []):
-            if stream.get('codec_type') == 'video' and not video_stream:
-                video_stream = stream
-            elif stream.get('codec_type') == 'audio' and not audio_stream:
-                audio_stream = stream
-
-        if not video_stream:
+        info = probe_video(input_path)
+        if not info:
             print("No video stream found")
             return False
 
-        # Get video dimensions
-        width = video_stream.get('width', 0)
-        height = video_stream.get('height', 0)
+        duration = info['duration']
+        width = info['width']
+        height = info['height']
+        audio_stream = info['has_audio']
+        current_size_mb = os.path.getsize(input_path) / (1024 * 1024)
 
         # Calculate needed bitrate for target size
         needed_bitrate_kbps = int((target_size_mb * 8 * 1024) / duration)
@@ -101,51 +337,60 @@ def compress_video(input_path: str, output_path: str, target_size_mb: float = 90
         print(f"  Target bitrates - Video: {video_bitrate}k, Audio: {audio_bitrate}k")
 
         # Build compression command
-        cmd = ['ffmpeg', '-y', '-i', input_path]
+        # Errors only on stderr - the progress stats would otherwise pile up in the pipe
+        input_args = ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y']
+        if info['mp4_header']:
+            # The moov box already describes every stream - skip ffmpeg's own probing
+            input_args.extend(['-probesize', '32', '-analyzeduration', '0'])
+        input_args.extend(['-i', input_path])
 
         # Add video filters if needed
         filters = []
 
-        # Downscale if resolution is too high
-        if height > 720:
-            filters.append('scale=-2:720')
-            print(f"  Downscaling {height}p -> 720p")
-        elif height > 480 and current_size_mb > target_size_mb * 1.5:
-            filters.append('scale=-2:480')
-            print(f"  Downscaling {height}p -> 480p")
+        # Downscale the short side to 480 - enough detail for Gemini, and the bitrate
+        # budget goes further. Keyed on the short side so portrait clips (most uploads)
+        # become 480x854 rather than 270x480; decided on ffmpeg's post-rotation size.
+        if min(width, height) > 480:
+            filters.append("scale='if(gt(iw,ih),-2,480)':'if(gt(iw,ih),480,-2)'")
+            print(f"  Downscaling {width}x{height} -> 480p (short side)")
 
         if filters:
-            cmd.extend(['-vf', ','.join(filters)])
-
-        # Video encoding
-        cmd.extend([
-            '-c:v', 'libx264',
-            '-preset', 'medium',  # Good compression
-            '-b:v', f'{video_bitrate}k',
-            '-maxrate', f'{int(video_bitrate * 1.5)}k',
-            '-bufsize', f'{video_bitrate * 2}k',
-            '-pix_fmt', 'yuv420p',
-        ])
+            input_args.extend(['-vf', ','.join(filters)])
 
         # Audio encoding
+        output_args = []
         if audio_stream:
-            cmd.extend([
+            output_args.extend([
                 '-c:a', 'aac',
                 '-b:a', f'{audio_bitrate}k',
                 '-ac', '2',
             ])
         else:
-            cmd.extend(['-an'])
+            output_args.extend(['-an'])
 
-        # Output options
-        cmd.extend([
-            '-movflags', '+faststart',
+        # Output options - fragmented MP4 writes its moov up front, so there is no
+        # second faststart pass rewriting the whole file after the encode
+        output_args.extend([
+            '-movflags', 'frag_keyframe+empty_moov+default_base_moof',
+            '-f', 'mp4',
             output_path
         ])
 
-        # Run compression with timeout
-        print(f"  Running ffmpeg compression...")
-        subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+        # Run compression with timeout. A hardware encoder can be listed without a
+        # usable device, so fall through to the next one if ffmpeg fails.
+        for encoder in h264_encoders():
+            cmd = ENCODE_PRIORITY_PREFIX + input_args + _video_codec_args(encoder, video_bitrate) + output_args
+            print(f"  Running ffmpeg compression ({encoder})...")
+            try:
+                subprocess.run(
+                    cmd, check=True, timeout=300,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+                )
+                break
+            except subprocess.CalledProcessError:
+                if encoder == 'libx264':
+                    raise
+                print(f"  {encoder} failed, trying next encoder")
 
         # Check output
         if os.path.exists(output_path):
@@ -170,10 +415,141 @@ def compress_video(input_path: str, output_path: str, target_size_mb: float = 90
         return False
 
 
+def looks_like_video(head: bytes) -> bool:
+    """Check the first bytes of an upload against the magic numbers of supported containers."""
+    if head[4:8] in MP4_BOX_TYPES:
+        return True
+    if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+        return True
+    # MPEG-TS has no header, just 0x47 sync bytes starting each 188-byte packet
+    if head[:1] == b'\x47' and head[TS_PACKET_SIZE:TS_PACKET_SIZE + 1] == b'\x47':
+        return True
+    return head.startswith(VIDEO_MAGIC_PREFIXES)
+
+
+def _sse(event: Dict[str, Any]) -> bytes:
+    """Frame one server-sent event; StreamingResponse passes the bytes through as-is."""
+    return b'data: ' + orjson.dumps(event) + b'\n\n'
+
+
+def make_temp_path(filename: Optional[str], prefix: str = "temp_", size: Optional[int] = None) -> str:
+    """
+    Create a unique empty file in temp_uploads and return its path.
+
+    Only the extension of the client's filename is kept (the analyzer and ffmpeg go by
+    it); the rest of the name never reaches the filesystem. When the final size is
+    known, the space is reserved up front so the filesystem can lay it out in one
+    extent; write it without truncating (mode "r+b").
+    """
+    # Short extensions only; .mp4 when there is none (the analyzer's default type anyway)
+    ext = os.path.splitext(filename or "")[1][:8] or ".mp4"
+    fd, path = tempfile.mkstemp(dir="temp_uploads", prefix=prefix, suffix=ext)
+    try:
+        if size and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass  # Not supported by this filesystem - just a missed optimization
+    finally:
+        os.close(fd)
+    return path
+
+
+def save_upload(src, dest_path: str, max_bytes: int) -> Optional[Tuple[int, str]]:
+    """
+    Copy an upload's spooled file to dest_path, hashing it on the way.
+
+    Blocking - run it in a worker thread. Returns (size, SHA-256 hex digest), or None
+    as soon as more than max_bytes have been read.
+    """
+    upload_hash = hashlib.sha256()
+    size = 0
+    src.seek(0)
+    # r+b keeps the space make_temp_path reserved; truncate() drops any excess
+    with open(dest_path, 'r+b') as f:
+        while chunk := src.read(UPLOAD_CHUNK):
+            size += len(chunk)
+            if size > max_bytes:
+                return None
+            upload_hash.update(chunk)
+            f.write(chunk)
+        f.truncate()
+    return size, upload_hash.hexdigest()
+
+
+def remove_temp_files(*paths: Optional[str]):
+    """Delete the given temp files, skipping unset paths and files already gone."""
+    for path in paths:
+        if path:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def cached_output(digest: str) -> Optional[str]:
+    """Output file of an earlier analysis of the upload with this SHA-256, if it still exists."""
+    output_path = _result_cache.get(digest)
+    if output_path is None:
+        return None
+    if not os.path.exists(output_path):
+        del _result_cache[digest]
+        return None
+    _result_cache.move_to_end(digest)
+    return output_path
+
+
+def remember_output(digest: str, output_path: str):
+    """Record the analysis output for an upload, evicting the least recently used entry."""
+    _result_cache[digest] = output_path
+    _result_cache.move_to_end(digest)
+    if len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_analyzer() -> IterativeClipAnalyzer:
+    """
+    Analyzer shared by all requests, so the ontology and brain pickles are loaded once
+    and every upload builds on the same in-memory state. Created on first use, after
+    the endpoints have checked that an API key is configured.
+    """
+    return IterativeClipAnalyzer(
+        model='pro',
+        ontology_path='master_clip_ontology.pkl'
+    )
+
+
+@app.on_event("startup")
+async def check_api_key():
+    """Report a missing API key when the server starts, not only once an upload has finished."""
+    if not Config.GOOGLE_API_KEY:
+        print("WARNING: GOOGLE_API_KEY is not set - video analysis requests will be refused")
+
+
+@app.on_event("startup")
+async def detect_encoders():
+    """Run the one-time `ffmpeg -encoders` query at startup rather than on the first upload."""
+    encoders = await asyncio.to_thread(h264_encoders)
+    print(f"H.264 encoders for compression: {', '.join(encoders)}")
+
+
+@lru_cache(maxsize=None)
+def index_page() -> Tuple[bytes, str]:
+    """public/index.html and its ETag, read once per process (it only changes on deploy)."""
+    with open("public/index.html", "rb") as f:
+        body = f.read()
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
+
 @app.get("/")
-async def root():
+async def root(request: Request):
     """Serve the web application"""
-    return FileResponse("public/index.html")
+    body, etag = index_page()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
 
 
 @app.post("/api/analyze-video-stream")
@@ -186,168 +562,150 @@ async def analyze_video_stream(
     """
     async def generate():
         temp_video_path = None
+        compressed_path = None
 
         try:
             # Check API key
-            from config import Config
             if not Config.GOOGLE_API_KEY:
-                yield f"data: {json.dumps({'error': 'API key not configured'})}\n\n"
+                yield _sse({'error': 'API key not configured'})
+                return
+
+            # Validate file type from its leading bytes, then rewind for the copy
+            head = await video.read(VIDEO_SNIFF_BYTES)
+            await video.seek(0)
+            if not looks_like_video(head):
+                yield _sse({'error': 'Invalid file type. Please upload a video file (MP4, MOV, AVI, MKV)'})
                 return
 
-            # Validate file type
-            allowed_types = ['video/mp4', 'video/quicktime', 'video/x-msvideo', 'video/x-matroska', 'video/avi', 'video/mov']
-            if video.content_type not in allowed_types and not video.content_type.startswith('video/'):
-                yield f"data: {json.dumps({'error': 'Invalid file type. Please upload a video file (MP4, MOV, AVI, MKV)'})}\n\n"
+            # Multipart parsing already knows the size - reject before copying anything
+            if video.size and video.size > 200 * 1024 * 1024:
+                yield _sse({'error': 'Video too large (max 200MB)'})
                 return
 
             # Send initial message
-            yield f"data: {json.dumps({'status': 'Uploading video...'})}\n\n"
-            await asyncio.sleep(0.1)
+            yield _sse({'status': 'Uploading video...'})
 
             # Save uploaded file
-            file_size = 0
-            temp_video_path = os.path.join("temp_uploads", f"temp_{datetime.now().timestamp()}_{video.filename}")
-
-            with open(temp_video_path, "wb") as f:
-                while chunk := await video.read(1024 * 1024):
-                    file_size += len(chunk)
-                    if file_size > 200 * 1024 * 1024:  # 200MB limit
-                        yield f"data: {json.dumps({'error': 'Video too large (max 200MB)'})}\n\n"
-                        return
-                    f.write(chunk)
+            temp_video_path = make_temp_path(video.filename, size=video.size)
+            saved = await asyncio.to_thread(save_upload, video.file, temp_video_path, 200 * 1024 * 1024)
+            if saved is None:  # 200MB limit
+                yield _sse({'error': 'Video too large (max 200MB)'})
+                return
+            file_size, upload_digest = saved
 
-            yield f"data: {json.dumps({'status': f'Upload complete ({file_size/1024/1024:.1f}MB)'})}\n\n"
-            await asyncio.sleep(0.1)
+            yield _sse({'status': f'Upload complete ({file_size/1024/1024:.1f}MB)'})
+
+            # Identical upload analyzed before - skip compression and Gemini entirely
+            cached_path = cached_output(upload_digest)
+            if cached_path:
+                yield _sse({'status': 'This video was already analyzed, loading saved results...'})
+                async for event in output_events(cached_path):
+                    yield event
+                return
 
             # Compress if needed
             video_to_analyze = temp_video_path
-            compressed_path = None
 
             # Compress videos larger than 100MB
             if file_size > 100 * 1024 * 1024:  # If larger than 100MB, compress
-                yield f"data: {json.dumps({'status': 'Video is large, compressing to ~90MB...'})}\n\n"
-                await asyncio.sleep(0.1)
+                yield _sse({'status': 'Video is large, compressing to ~90MB...'})
 
-                compressed_path = temp_video_path.replace('.', '_compressed.')
-                # Compress to 90MB
-                success = compress_video(temp_video_path, compressed_path, target_size_mb=90)
+                compressed_path = make_temp_path(video.filename, prefix="compressed_")
+                # Compress to 90MB. ffmpeg needs the whole upload on disk (an mp4 with its
+                # moov atom at the end can't be demuxed from a pipe), but the encode itself
+                # runs off the event loop so other streams keep flowing
+                success = await asyncio.to_thread(
+                    compress_video, temp_video_path, compressed_path, target_size_mb=90
+                )
 
                 if success and os.path.exists(compressed_path):
                     compressed_size = os.path.getsize(compressed_path)
-                    yield f"data: {json.dumps({'status': f'Compressed to {compressed_size/1024/1024:.1f}MB'})}\n\n"
-                    video_to_analyze = compressed_path
+                    yield _sse({'status': f'Compressed to {compressed_size/1024/1024:.1f}MB'})
+                    # Move the compressed file over the original, freeing its space right away
+                    os.replace(compressed_path, temp_video_path)
+                    compressed_path = None
                 else:
-                    yield f"data: {json.dumps({'error': 'Failed to compress video. Please upload a smaller file.'})}\n\n"
+                    yield _sse({'error': 'Failed to compress video. Please upload a smaller file.'})
                     return
 
             # Verify video file size before sending to Gemini
             final_size = os.path.getsize(video_to_analyze) / (1024 * 1024)
             if final_size > 110:
-                yield f"data: {json.dumps({'error': f'Video still too large ({final_size:.1f}MB). Please try a shorter video.'})}\n\n"
+                yield _sse({'error': f'Video still too large ({final_size:.1f}MB). Please try a shorter video.'})
                 return
 
             # Capture stdout to send progress messages
-            yield f"data: {json.dumps({'status': 'Initializing analyzer...'})}\n\n"
+            yield _sse({'status': 'Initializing analyzer...'})
 
-            # Create analyzer
-            analyzer = IterativeClipAnalyzer(
-                model='pro',
-                ontology_path='master_clip_ontology.pkl'
-            )
+            analyzer = get_analyzer()
 
-            yield f"data: {json.dumps({'status': f'Sending video ({final_size:.1f}MB) to Gemini AI...'})}\n\n"
-            yield f"data: {json.dumps({'status': 'This may take 5-10 minutes, please wait...'})}\n\n"
-            await asyncio.sleep(0.1)
+            yield _sse({'status': f'Sending video ({final_size:.1f}MB) to Gemini AI...'})
+            yield _sse({'status': 'This may take 5-10 minutes, please wait...'})
 
-            # Process video with timeout - run in thread pool with periodic updates
+            # Process video with timeout - run on the analysis pool with periodic updates
             try:
-                import concurrent.futures
-                import time
-
                 def run_analysis():
                     # Run analysis without capturing stdout (shows progress in server logs)
                     return analyzer.process_video(video_to_analyze, None)
 
-                # Create thread pool and run with timeout
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_analysis)
-                    try:
-                        # Wait max 30 minutes for analysis with periodic updates
-                        yield f"data: {json.dumps({'status': 'Sending video to Gemini AI...'})}\n\n"
-                        await asyncio.sleep(2)
-
-                        timeout = 1800  # 30 minutes
-                        start_time = time.time()
-                        check_interval = 10  # Check every 10 seconds
-                        last_update = 0
-
-                        while True:
-                            elapsed = time.time() - start_time
-
-                            # Check if analysis is done or failed
-                            try:
-                                result = future.result(timeout=0.1)
-                                yield f"data: {json.dumps({'status': 'Analysis complete, reading results...'})}\n\n"
-                                break
-                            except concurrent.futures.TimeoutError:
-                                # Still running, send status update
-                                if elapsed > timeout:
-                                    yield f"data: {json.dumps({'error': 'Analysis timeout after 30 minutes. Please try a shorter video.'})}\n\n"
-                                    return
-
-                                # Send periodic updates every 30 seconds
-                                if elapsed - last_update >= 30:
-                                    minutes_elapsed = int(elapsed / 60)
-                                    seconds_part = int(elapsed % 60)
-                                    yield f"data: {json.dumps({'status': f'Still processing with Gemini... ({minutes_elapsed}m{seconds_part:02d}s elapsed)'})}\n\n"
-                                    last_update = elapsed
-
-                                await asyncio.sleep(check_interval)
-                                continue
-                            except Exception as analysis_error:
-                                # Analysis failed with an exception
-                                error_msg = str(analysis_error)
-                                print(f"Analysis failed: {error_msg}")
-                                yield f"data: {json.dumps({'error': f'Analysis failed: {error_msg}'})}\n\n"
-                                return
-
-                    except Exception as e:
-                        print(f"Loop error: {str(e)}")
-                        yield f"data: {json.dumps({'error': f'Processing error: {str(e)}'})}\n\n"
+                analysis_task = asyncio.get_running_loop().run_in_executor(ANALYSIS_POOL, run_analysis)
+
+                # Wait max 30 minutes for analysis with periodic updates
+                yield _sse({'status': 'Sending video to Gemini AI...'})
+
+                timeout = 1800  # 30 minutes
+                update_interval = 30  # Progress message every 30 seconds
+                start_time = time.time()
+
+                while True:
+                    # Sleeps until the analysis finishes, waking only to send a progress update
+                    done, _ = await asyncio.wait({analysis_task}, timeout=update_interval)
+                    elapsed = time.time() - start_time
+
+                    # Check if analysis is done or failed
+                    if done:
+                        try:
+                            result = analysis_task.result()
+                        except Exception as analysis_error:
+                            # Analysis failed with an exception
+                            error_msg = str(analysis_error)
+                            print(f"Analysis failed: {error_msg}")
+                            yield _sse({'error': f'Analysis failed: {error_msg}'})
+                            return
+                        yield _sse({'status': 'Analysis complete, reading results...'})
+                        break
+
+                    # Still running, send status update
+                    if elapsed > timeout:
+                        yield _sse({'error': 'Analysis timeout after 30 minutes. Please try a shorter video.'})
                         return
 
+                    minutes_elapsed = int(elapsed / 60)
+                    seconds_part = int(elapsed % 60)
+                    yield _sse({'status': f'Still processing with Gemini... ({minutes_elapsed}m{seconds_part:02d}s elapsed)'})
+
             except Exception as e:
-                yield f"data: {json.dumps({'error': f'Failed to start analysis: {str(e)}'})}\n\n"
+                yield _sse({'error': f'Failed to start analysis: {str(e)}'})
                 return
 
-            # Read the output file content
+            # Check the output file
             output_file_path = result.get('output', '')
-            output_content = ''
             if output_file_path and os.path.exists(output_file_path):
-                with open(output_file_path, 'r', encoding='utf-8') as f:
-                    output_content = f.read()
+                remember_output(upload_digest, output_file_path)
             else:
-                yield f"data: {json.dumps({'error': 'Analysis completed but no output file found'})}\n\n"
+                yield _sse({'error': 'Analysis completed but no output file found'})
                 return
 
             # Send final result
-            yield f"data: {json.dumps({'success': True, 'output': output_content, 'status': 'Complete!'})}\n\n"
+            async for event in output_events(output_file_path):
+                yield event
 
         except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            yield _sse({'error': str(e)})
 
         finally:
             # Cleanup temp files
-            if temp_video_path and os.path.exists(temp_video_path):
-                try:
-                    os.remove(temp_video_path)
-                except:
-                    pass
-            if compressed_path and os.path.exists(compressed_path):
-                try:
-                    os.remove(compressed_path)
-                except:
-                    pass
+            remove_temp_files(temp_video_path, compressed_path)
 
     return StreamingResponse(generate(), media_type="text/event-stream")
 
@@ -367,119 +725,174 @@ async def analyze_video(
 
     try:
         # Check if API key is configured in .env
-        from config import Config
         if not Config.GOOGLE_API_KEY:
             raise HTTPException(
                 status_code=400,
                 detail="API key not configured. Please create a .env file with GOOGLE_API_KEY=your_key_here"
             )
 
-        # Validate file size (20MB limit)
-        file_size = 0
-        temp_video_path = os.path.join("temp_uploads", f"temp_{datetime.now().timestamp()}_{video.filename}")
-
-        with open(temp_video_path, "wb") as f:
-            while chunk := await video.read(1024 * 1024):  # Read 1MB at a time
-                file_size += len(chunk)
-                if file_size > 20 * 1024 * 1024:  # 20MB limit
-                    raise HTTPException(status_code=413, detail="Video file too large. Maximum size is 20MB.")
-                f.write(chunk)
-
-        # Create analyzer (uses Config.GOOGLE_API_KEY from .env)
-        analyzer = IterativeClipAnalyzer(
-            model='pro',
-            ontology_path='master_clip_ontology.pkl'
-        )
+        # Validate file size (20MB limit) - up front when the upload size is known
+        if video.size and video.size > 20 * 1024 * 1024:
+            raise HTTPException(status_code=413, detail="Video file too large. Maximum size is 20MB.")
 
-        # Process video
-        result = analyzer.process_video(temp_video_path, None)
+        # Validate file type from its leading bytes, then rewind for the copy
+        head = await video.read(VIDEO_SNIFF_BYTES)
+        await video.seek(0)
+        if not looks_like_video(head):
+            raise HTTPException(
+                status_code=415,
+                detail="Invalid file type. Please upload a video file (MP4, MOV, AVI, MKV)"
+            )
+
+        temp_video_path = make_temp_path(video.filename, size=video.size)
+        saved = await asyncio.to_thread(save_upload, video.file, temp_video_path, 20 * 1024 * 1024)
+        if saved is None:  # 20MB limit
+            raise HTTPException(status_code=413, detail="Video file too large. Maximum size is 20MB.")
+        file_size, upload_digest = saved
+
+        # Reuse the result of an earlier analysis of the same upload
+        output_file_path = cached_output(upload_digest)
+        if not output_file_path:
+            # Shared analyzer (uses Config.GOOGLE_API_KEY from .env)
+            analyzer = get_analyzer()
+
+            # Process video on the analysis pool; calling it inline blocked the event loop
+            result = await asyncio.get_running_loop().run_in_executor(
+                ANALYSIS_POOL, analyzer.process_video, temp_video_path, None
+            )
+            output_file_path = result.get('output', '')
+            if output_file_path and os.path.exists(output_file_path):
+                remember_output(upload_digest, output_file_path)
 
         # Read the output file content
-        output_file_path = result.get('output', '')
         output_content = 'Analysis complete'
         if output_file_path and os.path.exists(output_file_path):
-            with open(output_file_path, 'r', encoding='utf-8') as f:
-                output_content = f.read()
+            async with aiofiles.open(output_file_path, 'r', encoding='utf-8') as f:
+                output_content = await f.read()
 
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "output": output_content,
             "output_file": output_file_path,
             "message": "Video analyzed successfully"
         })
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
     finally:
         # Cleanup temp file
-        if temp_video_path and os.path.exists(temp_video_path):
-            try:
-                os.remove(temp_video_path)
-            except:
-                pass
+        remove_temp_files(temp_video_path)
+
+
+# Characters read per chunk when streaming a text file into a JSON envelope
+CONTENT_STREAM_CHUNK = 64 * 1024
+
+
+def content_response(path: str, raw: bool = False):
+    """
+    Serve a text file as {"content": "<file text>"} without loading it whole.
+
+    The file is read and JSON-escaped in CONTENT_STREAM_CHUNK pieces, so a large
+    ontology log is never held in memory twice (raw + encoded). With raw=True the
+    file is sent as-is as text/plain (sendfile where available), for clients that
+    don't need the envelope.
+    """
+    if raw:
+        return FileResponse(path, media_type="text/plain; charset=utf-8")
+
+    async def generate():
+        yield '{"content": "'
+        async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+            while chunk := await f.read(CONTENT_STREAM_CHUNK):
+                # Escaping is per character, so encoded chunks concatenate cleanly
+                yield json.dumps(chunk, ensure_ascii=False)[1:-1]
+        yield '"}'
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+async def output_events(path: str):
+    """
+    SSE events delivering an analysis output file: {'chunk': ...} events the client
+    concatenates, then the final {'success': True} event.
+    """
+    async with aiofiles.open(path, 'r', encoding='utf-8') as f:
+        while block := await f.read(CONTENT_STREAM_CHUNK):
+            yield _sse({'chunk': block})
+    yield _sse({'success': True, 'status': 'Complete!'})
 
 
 @app.get("/api/data/master-ontology")
-async def get_master_ontology():
+async def get_master_ontology(raw: bool = False):
     """Get the master ontology file contents"""
     file_path = "master_clip_ontology.txt"
 
     if not os.path.exists(file_path):
-        return JSONResponse({
+        return ORJSONResponse({
             "content": "No master ontology data yet. Analyze some videos first!"
         })
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    return JSONResponse({"content": content})
+    return content_response(file_path, raw)
 
 
 @app.get("/api/data/script-clip-brain")
-async def get_script_clip_brain():
+async def get_script_clip_brain(raw: bool = False):
     """Get the script-clip brain file contents"""
     file_path = "script_clip_brain.txt"
 
     if not os.path.exists(file_path):
-        return JSONResponse({
+        return ORJSONResponse({
             "content": "No script-clip brain data yet. Analyze some videos first!"
         })
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return content_response(file_path, raw)
+
 
-    return JSONResponse({"content": content})
+# Last history listing and the (name, mtime_ns, size) of the files it was built from
+_history_cache: Dict[str, Any] = {'key': None, 'files': []}
 
 
 @app.get("/api/data/history")
 async def get_analysis_history():
     """Get list of all analysis files"""
-    pattern = "*_ontology_*.txt"
-    files = glob.glob(pattern)
+    # Same files as glob("*_ontology_*.txt"), minus the master ontology, stat'ed once each
+    with os.scandir(".") as it:
+        files = [
+            (entry.name, entry.stat())
+            for entry in it
+            if entry.name.endswith(".txt") and "_ontology_" in entry.name[:-4]
+            and not entry.name.startswith((".", "master_"))
+        ]
 
-    # Filter out master ontology
-    files = [f for f in files if not f.startswith("master_")]
+    # Unchanged files (none added, removed or rewritten) - the last listing stands
+    key = frozenset((name, stat.st_mtime_ns, stat.st_size) for name, stat in files)
+    if _history_cache['key'] == key:
+        return ORJSONResponse({"files": _history_cache['files']})
 
     # Sort by modification time (newest first)
-    files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    files.sort(key=lambda f: f[1].st_mtime, reverse=True)
 
     # Format file information
-    file_list = []
-    for file_path in files:
-        stat = os.stat(file_path)
-        file_list.append({
-            "name": os.path.basename(file_path),
-            "path": file_path,
+    file_list = [
+        {
+            "name": name,
+            "path": name,
             "size": f"{stat.st_size / 1024:.1f} KB",
             "date": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-        })
+        }
+        for name, stat in files
+    ]
+    _history_cache['key'] = key
+    _history_cache['files'] = file_list
 
-    return JSONResponse({"files": file_list})
+    return ORJSONResponse({"files": file_list})
 
 
 @app.get("/api/data/file")
-async def get_file_content(path: str):
+async def get_file_content(path: str, raw: bool = False):
     """Get contents of a specific analysis file"""
     # Security: ensure path doesn't escape current directory
     if ".." in path or path.startswith("/"):
@@ -488,10 +901,7 @@ async def get_file_content(path: str):
     if not os.path.exists(path):
         raise HTTPException(status_code=404, detail="File not found")
 
-    with open(path, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    return JSONResponse({"content": content})
+    return content_response(path, raw)
 
 
 @app.get("/api/health")